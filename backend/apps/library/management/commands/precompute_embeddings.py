@@ -12,7 +12,7 @@ from apps.library.models import ReferenceSentence
 from nlp_core.vectorizer import batch_audio_to_embeddings
 from nlp_core.audio_slicer import slice_audio_by_timestamps
 from nlp_core.aligner import get_phoneme_timestamps_with_text
-import pickle
+from apps.practice.services import AssessmentService
 import os
 
 logger = logging.getLogger(__name__)
@@ -128,7 +128,7 @@ class Command(BaseCommand):
                 # Step 5: Serialize and save to database
                 self.stdout.write('  → Saving to database...')
                 with transaction.atomic():
-                    sentence.reference_embeddings = pickle.dumps(embeddings)
+                    sentence.reference_embeddings = AssessmentService._serialize_embeddings(embeddings)
                     sentence.save(update_fields=['reference_embeddings'])
 
                 self.stdout.write(self.style.SUCCESS(
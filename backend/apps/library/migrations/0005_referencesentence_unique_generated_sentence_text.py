@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("library", "0004_alter_referencesentence_difficulty_level"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="referencesentence",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("source", "llm_generated")),
+                fields=("text",),
+                name="unique_generated_sentence_text",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+"""
+Covering partial index for sublevel sentence-pool lookups.
+
+Covers SublevelSessionView._get_sentence_pool, which selects ids where
+is_validated = TRUE by difficulty_level + sublevel. INCLUDE is PostgreSQL-only
+and ignored on SQLite.
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0005_referencesentence_unique_generated_sentence_text'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='referencesentence',
+            index=models.Index(
+                fields=['difficulty_level', 'sublevel'],
+                name='ref_sent_valid_lvl_sub_idx',
+                condition=models.Q(is_validated=True),
+                include=['id'],
+            ),
+        ),
+    ]
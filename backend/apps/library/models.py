@@ -131,6 +131,24 @@ class ReferenceSentence(models.Model):
         verbose_name = 'Reference Sentence'
         verbose_name_plural = 'Reference Sentences'
         ordering = ['difficulty_level', '-created_at']
+        constraints = [
+            # Dedup LLM-generated sentences (curated seed data may repeat text)
+            models.UniqueConstraint(
+                fields=['text'],
+                condition=models.Q(source='llm_generated'),
+                name='unique_generated_sentence_text',
+            ),
+        ]
+        indexes = [
+            # Covering partial index for SublevelSessionView's sentence pool
+            # (validated ids by level + sublevel) -> index-only scan on Postgres
+            models.Index(
+                fields=['difficulty_level', 'sublevel'],
+                name='ref_sent_valid_lvl_sub_idx',
+                condition=models.Q(is_validated=True),
+                include=['id'],
+            ),
+        ]
     
     def __str__(self):
         return f"{self.text[:50]}..." if len(self.text) > 50 else self.text
@@ -28,10 +28,14 @@ class PracticeConfig(AppConfig):
         try:
             logger.info("[STARTUP] Pre-warming ML models...")
             
-            # 1. Whisper ASR model (~5s)
-            from nlp_core.asr_validator import _get_whisper_model
-            _get_whisper_model()
-            logger.info(f"[STARTUP] Whisper loaded ({time.time()-start:.1f}s)")
+            # 1. Whisper ASR client (hosted on Groq; no local model to load).
+            # Isolated so a missing GROQ_API_KEY doesn't skip the models below.
+            try:
+                from nlp_core.asr_validator import _get_groq_client
+                _get_groq_client()
+                logger.info(f"[STARTUP] Whisper client ready ({time.time()-start:.1f}s)")
+            except Exception as e:
+                logger.warning(f"[STARTUP] Whisper client not initialized: {e}")
             
             # 2. Forced alignment model (~6s)
             from nlp_core.alignment.models import get_forced_alignment_model
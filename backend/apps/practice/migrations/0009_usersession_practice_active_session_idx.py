@@ -0,0 +1,25 @@
+"""
+Partial index for active-session lookups.
+
+Covers AssessmentView._get_or_create_session, which filters
+user + ended_at IS NULL + started_at within today.
+"""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practice', '0008_performance_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(
+                fields=['user', '-started_at'],
+                name='practice_active_session_idx',
+                condition=models.Q(ended_at__isnull=True),
+            ),
+        ),
+    ]
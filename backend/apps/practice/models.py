@@ -41,6 +41,14 @@ class UserSession(models.Model):
         verbose_name = 'User Session'
         verbose_name_plural = 'User Sessions'
         ordering = ['-started_at']
+        indexes = [
+            # Partial index for the "active session today" lookup in AssessmentView
+            models.Index(
+                fields=['user', '-started_at'],
+                name='practice_active_session_idx',
+                condition=models.Q(ended_at__isnull=True),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.session_type} ({self.started_at.date()})"
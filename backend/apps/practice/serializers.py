@@ -138,6 +138,12 @@ class SublevelSessionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'last_active_at']
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Callers that deferred the (potentially large) results column opt out here
+        if not self.context.get('include_results', True):
+            self.fields.pop('assessment_results')
+    
     def get_sentences(self, obj):
         """Return full sentence objects in the locked order."""
         from apps.library.models import ReferenceSentence
@@ -11,10 +11,36 @@ Orchestrates the pronunciation evaluation pipeline:
 
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# Max concurrent ASR calls per process. ASR is a network request to hosted
+# Whisper, so a small pool lets it overlap with local forced alignment.
+ASR_MAX_WORKERS = 4
+
+_asr_executor = None
+_asr_executor_lock = threading.Lock()
+
+
+def get_asr_executor() -> ThreadPoolExecutor:
+    """Get or create the process-wide ASR executor.
+    
+    Separate from the background pool: request threads block on these
+    results, so they must not queue behind fire-and-forget work.
+    """
+    global _asr_executor
+    if _asr_executor is None:
+        with _asr_executor_lock:
+            if _asr_executor is None:
+                _asr_executor = ThreadPoolExecutor(
+                    max_workers=ASR_MAX_WORKERS,
+                    thread_name_prefix='pronunex-asr',
+                )
+    return _asr_executor
+
 
 def distribute_sentence_score(overall_score, phonemes, timestamps=None):
     """
@@ -127,11 +153,36 @@ class AssessmentService:
             logger.info(f"[PERF] Audio clean: {(time.time()-t0)*1000:.0f}ms")
             
             # Step 2: ASR GATEKEEPER - Verify what user actually said
-            # This prevents the "Yes Man" bug where wrong speech gets valid scores
+            # This prevents the "Yes Man" bug where wrong speech gets valid scores.
+            # Runs on the ASR pool so the network round-trip overlaps with
+            # forced alignment (Step 4), which doesn't depend on the transcript.
             t0 = time.time()
             from nlp_core.asr_validator import validate_speech
-            asr_result = validate_speech(cleaned_audio_path, sentence.text)
-            logger.info(f"[PERF] ASR validation: {(time.time()-t0)*1000:.0f}ms")
+            asr_future = get_asr_executor().submit(
+                validate_speech, cleaned_audio_path, sentence.text
+            )
+            
+            # Step 3: Fetch precomputed phoneme sequence from DB
+            expected_phonemes = sentence.phoneme_sequence
+            alignment_map = sentence.alignment_map
+            
+            # Step 4: Run forced alignment on user audio (overlaps with ASR).
+            # An alignment failure is re-raised only after the ASR gate, so
+            # wrong speech is still reported as a content mismatch.
+            t1 = time.time()
+            alignment_error = None
+            try:
+                user_timestamps = self._align_audio(
+                    cleaned_audio_path, 
+                    expected_phonemes,
+                    sentence_text=sentence.text
+                )
+            except Exception as e:
+                alignment_error = e
+            logger.info(f"[PERF] Forced alignment: {(time.time()-t1)*1000:.0f}ms")
+            
+            asr_result = asr_future.result()
+            logger.info(f"[PERF] ASR validation: {(time.time()-t0)*1000:.0f}ms (overlapped)")
             
             # REJECT completely wrong speech (similarity too low)
             if not asr_result.get('can_proceed', False):
@@ -149,10 +200,11 @@ class AssessmentService:
             
             # Step 2b: WORD-LEVEL VALIDATION (mentor's guidance)
             # Check word alignment but DON'T BLOCK - continue to phoneme analysis
-            from nlp_core.word_validator import validate_word_count
+            from nlp_core.word_validator import normalize_sentence, validate_word_count
             transcribed_words = asr_result.get('transcribed', '').lower().split()
-            expected_words = sentence.text.lower().split()
-            word_validation = validate_word_count(transcribed_words, expected_words)
+            word_validation = validate_word_count(
+                transcribed_words, normalize_sentence(sentence.text)
+            )
             
             # Store word validation info for later (don't block pipeline)
             word_validation_info = {
@@ -165,18 +217,8 @@ class AssessmentService:
                 'message': word_validation.message
             }
             
-            # Step 3: Fetch precomputed phoneme sequence from DB
-            expected_phonemes = sentence.phoneme_sequence
-            alignment_map = sentence.alignment_map
-            
-            # Step 4: Run forced alignment on user audio
-            t0 = time.time()
-            user_timestamps = self._align_audio(
-                cleaned_audio_path, 
-                expected_phonemes,
-                sentence_text=sentence.text
-            )
-            logger.info(f"[PERF] Forced alignment: {(time.time()-t0)*1000:.0f}ms")
+            if alignment_error is not None:
+                raise alignment_error
             
             # Step 5: CONTEXTUAL EMBEDDINGS (tensor slicing, not audio slicing!)
             # This fixes the "Context-Blind" bug
@@ -585,3 +627,18 @@ class AssessmentService:
             'processing_time_ms': processing_time,
             'dev_mode': True,
         }
+
+
+# Singleton instance (the service is stateless after construction)
+_assessment_service = None
+_assessment_service_lock = threading.Lock()
+
+
+def get_assessment_service() -> AssessmentService:
+    """Get or create singleton assessment service."""
+    global _assessment_service
+    if _assessment_service is None:
+        with _assessment_service_lock:
+            if _assessment_service is None:
+                _assessment_service = AssessmentService()
+    return _assessment_service
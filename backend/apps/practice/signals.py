@@ -3,19 +3,26 @@ Signal handlers for practice app.
 
 Automatically end sessions after a period of inactivity.
 Invalidate dashboard cache on new attempts.
+Invalidate cached sentence pools when reference sentences change.
 """
 
 import logging
 from datetime import timedelta
 from django.core.cache import cache
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
+from apps.library.models import ReferenceSentence
+
 from .models import Attempt, UserSession
 
 logger = logging.getLogger(__name__)
 
+# Bumped on ReferenceSentence changes; embedded in sentence-pool cache keys
+SENTENCE_POOL_GENERATION_KEY = 'sublevel_ids:generation'
+SENTENCE_POOL_FIELDS = {'is_validated', 'difficulty_level', 'sublevel'}
+
 
 @receiver(post_save, sender=Attempt)
 def invalidate_dashboard_cache(sender, instance, created, **kwargs):
@@ -28,6 +35,24 @@ def invalidate_dashboard_cache(sender, instance, created, **kwargs):
     cache.delete(f"phoneme_analytics:{user_id}")
 
 
+@receiver(post_save, sender=ReferenceSentence)
+@receiver(post_delete, sender=ReferenceSentence)
+def invalidate_sentence_pool_cache(sender, instance, **kwargs):
+    """Bump the sentence-pool generation so cached sublevel pools are rebuilt."""
+    update_fields = kwargs.get('update_fields')
+    if update_fields and not SENTENCE_POOL_FIELDS & set(update_fields):
+        return  # e.g. embedding/audio-only saves don't change the pool
+    bump_sentence_pool_generation()
+
+
+def bump_sentence_pool_generation():
+    """Invalidate all cached sentence pools (also used when stale IDs are found)."""
+    try:
+        cache.incr(SENTENCE_POOL_GENERATION_KEY)
+    except ValueError:
+        cache.set(SENTENCE_POOL_GENERATION_KEY, 1, None)
+
+
 @receiver(post_save, sender=Attempt)
 def auto_end_session_on_attempt(sender, instance, created, **kwargs):
     """
@@ -2,16 +2,21 @@
 API Views for practice sessions and assessments.
 """
 
+import hashlib
+import json
 import logging
-import threading
+import time
+from datetime import timedelta
 from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponseNotModified
 from django.utils import timezone
-from django.db.models import Avg
+from django.db.models import Avg, Count, F, Max, Prefetch, Q
 
 from .models import UserSession, Attempt, PhonemeError, SublevelProgress, SublevelSession
 from .serializers import (
@@ -24,11 +29,25 @@ from .serializers import (
     SublevelCompleteSerializer,
     SublevelSessionSerializer,
 )
-from .services import AssessmentService
-from apps.library.models import ReferenceSentence, Phoneme
+from .services import get_assessment_service
+from .signals import SENTENCE_POOL_GENERATION_KEY, bump_sentence_pool_generation
+from apps.library.models import ReferenceSentence, Phoneme, SentencePhoneme
+from services.background import run_in_background
 
 logger = logging.getLogger(__name__)
 
+# Scoring thresholds, bound once at import instead of per request
+WEAK_PHONEME_THRESHOLD = settings.SCORING_CONFIG.get('WEAK_PHONEME_THRESHOLD', 0.7)
+WEAK_PHONEME_THRESHOLD_SUBLEVEL = settings.SCORING_CONFIG.get('WEAK_PHONEME_THRESHOLD_SUBLEVEL', 0.65)
+
+# Reference audio existence is cached to skip storage checks on hot sentences
+REFERENCE_AUDIO_CACHE_TTL = 3600
+TTS_LOCK_TTL = 60
+TTS_WAIT_INTERVAL = 0.5
+
+# Per level/sublevel sentence-ID pool for SublevelSessionView
+SENTENCE_POOL_CACHE_TTL = 300
+
 
 class UserSessionListView(generics.ListCreateAPIView):
     """
@@ -178,8 +197,7 @@ class AssessmentView(APIView):
         self._ensure_reference_audio(sentence)
         
         # Run assessment pipeline
-        assessment_service = AssessmentService()
-        result = assessment_service.process_attempt(audio_file, sentence)
+        result = get_assessment_service().process_attempt(audio_file, sentence)
         
         # Handle expected error cases (return 200 so frontend can display them)
         if not result.get('success', False):
@@ -238,11 +256,7 @@ class AssessmentView(APIView):
             except Exception as e:
                 logger.error(f"Async analytics failed: {e}")
         
-        threading.Thread(
-            target=_update_analytics_async,
-            args=(request.user.id, attempt.id),
-            daemon=True
-        ).start()
+        run_in_background(_update_analytics_async, request.user.id, attempt.id)
         
         # === ASYNC: LLM feedback generation (saves ~2-7s) ===
         def _generate_feedback_async(attempt_id, phoneme_scores, weak_phonemes, sentence_text, overall_score):
@@ -266,17 +280,14 @@ class AssessmentView(APIView):
                 except Exception:
                     pass
         
-        threading.Thread(
-            target=_generate_feedback_async,
-            args=(
-                attempt.id,
-                result.get('phoneme_scores', []),
-                result.get('weak_phonemes', []),
-                sentence.text,
-                result.get('overall_score', 0)
-            ),
-            daemon=True
-        ).start()
+        run_in_background(
+            _generate_feedback_async,
+            attempt.id,
+            result.get('phoneme_scores', []),
+            result.get('weak_phonemes', []),
+            sentence.text,
+            result.get('overall_score', 0)
+        )
         
         # Build enriched weak phoneme details (articulation tips + practice words)
         t_wp = _time.time()
@@ -311,12 +322,14 @@ class AssessmentView(APIView):
     
     def _get_or_create_session(self, user):
         """Get active session or create new one."""
-        # Find active session (no end time, created today)
-        today = timezone.now().date()
+        # Find active session (no end time, created today).
+        # Range filter instead of started_at__date so the partial index is usable.
+        today_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
         session = UserSession.objects.filter(
             user=user,
             ended_at__isnull=True,
-            started_at__date=today
+            started_at__gte=today_start,
+            started_at__lt=today_start + timedelta(days=1)
         ).first()
         
         if not session:
@@ -343,9 +356,6 @@ class AssessmentView(APIView):
     
     def _save_phoneme_errors(self, attempt, phoneme_scores):
         """Save phoneme-level results to database (bulk optimized)."""
-        from django.conf import settings
-        threshold = settings.SCORING_CONFIG.get('WEAK_PHONEME_THRESHOLD', 0.7)
-        
         if not phoneme_scores:
             return
         
@@ -384,9 +394,7 @@ class AssessmentView(APIView):
         2. If none found but overall score < 0.95, return the 3 lowest-scoring phonemes
         3. Always provide actionable feedback when there's room for improvement
         """
-        from apps.library.models import SentencePhoneme
-        
-        threshold = settings.SCORING_CONFIG.get('WEAK_PHONEME_THRESHOLD', 0.85)
+        threshold = WEAK_PHONEME_THRESHOLD
         
         # Get all phoneme errors sorted by score (worst first), deduplicate
         all_errors = (
@@ -452,9 +460,26 @@ class AssessmentView(APIView):
         return details
     
     def _ensure_reference_audio(self, sentence):
-        """Ensure reference audio exists, generate via TTS if missing."""
+        """Ensure reference audio exists, generate via TTS if missing.
+        
+        The "audio exists" result is cached so hot sentences skip the storage
+        check (a stat locally, an HTTP round-trip on Supabase). A short-lived
+        cache lock stops concurrent requests from generating the same TTS twice;
+        requests that lose the lock wait for the holder's audio instead.
+        """
+        ok_key = f"ref_audio_ok:{sentence.id}"
+        if cache.get(ok_key):
+            return
+        
         # Use storage-agnostic check (works with both local and Supabase)
         if sentence.has_audio():
+            cache.set(ok_key, 1, REFERENCE_AUDIO_CACHE_TTL)
+            return
+        
+        lock_key = f"tts_lock:{sentence.id}"
+        if not cache.add(lock_key, 1, TTS_LOCK_TTL):
+            logger.info(f"TTS already in progress for sentence {sentence.id}, waiting")
+            self._wait_for_reference_audio(sentence, ok_key, lock_key)
             return
         
         # Generate TTS audio to temp file, then save via Django storage API
@@ -479,12 +504,34 @@ class AssessmentView(APIView):
                 
                 # Clean up temp file
                 os.unlink(temp_path)
+                cache.set(ok_key, 1, REFERENCE_AUDIO_CACHE_TTL)
                 logger.info(f"TTS generated and uploaded for sentence {sentence.id}")
             else:
                 logger.warning(f"TTS returned no audio for sentence {sentence.id}")
         except Exception as e:
             logger.error(f"TTS generation failed for sentence {sentence.id}: {str(e)}")
             # Continue anyway - will fall back to dev mode in assessment
+        finally:
+            cache.delete(lock_key)
+    
+    def _wait_for_reference_audio(self, sentence, ok_key, lock_key):
+        """Wait up to TTS_LOCK_TTL for another request's TTS to finish.
+        
+        Returns once the audio exists, the lock holder gives up (the lock is
+        released without audio), or the wait times out. The sentence is
+        reloaded so the assessment sees the holder's audio file.
+        """
+        deadline = time.monotonic() + TTS_LOCK_TTL
+        while time.monotonic() < deadline:
+            time.sleep(TTS_WAIT_INTERVAL)
+            if cache.get(ok_key) or not cache.get(lock_key):
+                break
+        else:
+            logger.warning(f"Timed out waiting for TTS of sentence {sentence.id}")
+        
+        sentence.refresh_from_db(fields=['audio_file', 'audio_url'])
+        if sentence.has_audio():
+            cache.set(ok_key, 1, REFERENCE_AUDIO_CACHE_TTL)
 
 
 class AttemptFeedbackView(APIView):
@@ -505,27 +552,45 @@ class AttemptFeedbackView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            attempt = Attempt.objects.get(
-                id=attempt_id,
-                session__user=request.user
-            )
-        except Attempt.DoesNotExist:
+        # Project only the feedback column - no model instantiation per poll
+        feedback_rows = list(
+            Attempt.objects
+            .filter(id=attempt_id, session__user=request.user)
+            .values_list('llm_feedback', flat=True)[:1]
+        )
+        if not feedback_rows:
             return Response(
                 {'error': 'Attempt not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
-        
-        if attempt.llm_feedback:
-            return Response({
+        llm_feedback = feedback_rows[0]
+        
+        # Conditional response: unchanged polls get a bodiless 304
+        etag = self._compute_etag(llm_feedback)
+        if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+            response = HttpResponseNotModified()
+        elif llm_feedback:
+            response = Response({
                 'ready': True,
-                'llm_feedback': attempt.llm_feedback,
+                'llm_feedback': llm_feedback,
             })
         else:
-            return Response({
+            response = Response({
                 'ready': False,
                 'llm_feedback': None,
             })
+        
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+    
+    @staticmethod
+    def _compute_etag(llm_feedback):
+        """Quoted ETag: 'pending' until feedback exists, then a content hash."""
+        if not llm_feedback:
+            return '"pending"'
+        payload = json.dumps(llm_feedback, sort_keys=True, default=str)
+        return f'"{hashlib.md5(payload.encode("utf-8")).hexdigest()}"'
 
 
 class SublevelCompleteView(APIView):
@@ -590,8 +655,6 @@ class SublevelProgressView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        from django.db.models import Max, Count, Avg
-        
         progress_data = []
         for sublevel_num in ['1', '2']:
             progress_records = SublevelProgress.objects.filter(
@@ -655,16 +718,25 @@ class SublevelSummaryView(APIView):
         4. Match difficulty level when possible
         5. Return 2-5 most relevant sentences
         """
-        from django.db.models import Count, Q
-        from apps.library.models import SentencePhoneme
-        
         if not weak_phoneme_arpabets:
             return []
         
         # Limit to top 3 weak phonemes for focused practice
         target_phonemes = weak_phoneme_arpabets[:3]
         
-        # Strategy 1: Query sentences via SentencePhoneme junction table
+        # Load the matching junction rows alongside each sentence (no per-row query)
+        weak_sps = Prefetch(
+            'sentence_phonemes',
+            queryset=(
+                SentencePhoneme.objects
+                .filter(phoneme__arpabet__in=target_phonemes)
+                .select_related('phoneme')
+            ),
+            to_attr='weak_sps'
+        )
+        
+        # Strategy 1: Query sentences via SentencePhoneme junction table,
+        # ranked in SQL by how many distinct weak phonemes each one hits
         reinforcement_sentences = list(
             ReferenceSentence.objects
             .filter(
@@ -674,12 +746,13 @@ class SublevelSummaryView(APIView):
             .exclude(id__in=attempted_sentence_ids)  # Avoid repetition
             .annotate(
                 weak_phoneme_count=Count(
-                    'sentence_phonemes',
-                    filter=Q(sentence_phonemes__phoneme__arpabet__in=target_phonemes)
+                    'sentence_phonemes__phoneme',
+                    filter=Q(sentence_phonemes__phoneme__arpabet__in=target_phonemes),
+                    distinct=True
                 )
             )
             .order_by('-weak_phoneme_count', 'difficulty_level', 'id')  # Prioritize by relevance
-            .distinct()[:count]
+            .prefetch_related(weak_sps)[:count]
         )
         
         # Strategy 2 (fallback): If SentencePhoneme table is sparse, find sentences
@@ -693,7 +766,8 @@ class SublevelSummaryView(APIView):
                     is_validated=True
                 )
                 .exclude(id__in=attempted_sentence_ids)
-                .distinct()[:count]
+                .distinct()
+                .prefetch_related(weak_sps)[:count]
             )
         
         # Strategy 3 (last resort): Any validated sentence at same difficulty level
@@ -703,17 +777,15 @@ class SublevelSummaryView(APIView):
                 ReferenceSentence.objects
                 .filter(is_validated=True, difficulty_level=difficulty_level)
                 .exclude(id__in=attempted_sentence_ids)
-                .order_by('?')[:count]
+                .order_by('?')
+                .prefetch_related(weak_sps)[:count]
             )
         
         # Format response
         result = []
         for s in reinforcement_sentences:
-            # Get target phonemes from SentencePhoneme if available
-            sp_phonemes = list(
-                s.sentence_phonemes.filter(phoneme__arpabet__in=target_phonemes)
-                .values_list('phoneme__arpabet', flat=True)
-            ) if hasattr(s, 'sentence_phonemes') else []
+            # Target phonemes from the prefetched SentencePhoneme rows
+            sp_phonemes = [sp.phoneme.arpabet for sp in s.weak_sps]
             
             result.append({
                 'id': s.id,
@@ -757,9 +829,7 @@ class SublevelSummaryView(APIView):
         avg_score = sum(scores) / len(scores) if scores else 0
         
         # Get weak phonemes from attempts in this sublevel
-        from django.db.models import Avg
-        
-        threshold = settings.SCORING_CONFIG.get('WEAK_PHONEME_THRESHOLD', 0.7)
+        threshold = WEAK_PHONEME_THRESHOLD
         
         # Find all attempts for sentences in this sublevel session
         weak_phonemes_qs = (
@@ -856,47 +926,56 @@ class SublevelRecommendationView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        from apps.library.models import SentencePhoneme
-        
-        threshold = settings.SCORING_CONFIG.get('WEAK_PHONEME_THRESHOLD_SUBLEVEL', 0.65)
+        threshold = WEAK_PHONEME_THRESHOLD_SUBLEVEL
         
         # Aggregate weak phonemes across all attempts in this session
         weak_phonemes_qs = (
             PhonemeError.objects
             .filter(attempt__session=session)
-            .values('target_phoneme', 'target_phoneme__arpabet', 'target_phoneme__symbol')
-            .annotate(avg_score=Avg('similarity_score'))
+            .values('target_phoneme_id')
+            .annotate(
+                avg_score=Avg('similarity_score'),
+                arpabet=F('target_phoneme__arpabet'),
+                symbol=F('target_phoneme__symbol'),
+            )
             .filter(avg_score__lt=threshold)
             .order_by('avg_score')[:5]
         )
         
-        weak_phoneme_ids = [wp['target_phoneme'] for wp in weak_phonemes_qs]
-        weak_phoneme_list = [
-            {
-                'arpabet': wp['target_phoneme__arpabet'],
-                'symbol': wp['target_phoneme__symbol'],
+        weak_phoneme_ids = []
+        weak_phoneme_list = []
+        for wp in weak_phonemes_qs:
+            weak_phoneme_ids.append(wp['target_phoneme_id'])
+            weak_phoneme_list.append({
+                'arpabet': wp['arpabet'],
+                'symbol': wp['symbol'],
                 'avg_score': round(wp['avg_score'], 3),
-            }
-            for wp in weak_phonemes_qs
-        ]
+            })
         
         # Find recommended sentences targeting these weak phonemes
         recommended_sentences = []
         if weak_phoneme_ids:
+            # Prefetch only the weak-phoneme junction rows (phoneme joined in)
+            weak_sp_qs = (
+                SentencePhoneme.objects
+                .filter(phoneme_id__in=weak_phoneme_ids)
+                .select_related('phoneme')
+            )
+            # Filter on the FK column with the small (<=5) id list already in
+            # hand; Postgres plans this as `= ANY(ARRAY[...])` with no join to
+            # the phoneme table.
             sentences = (
                 ReferenceSentence.objects
-                .filter(sentence_phonemes__phoneme__in=weak_phoneme_ids)
+                .filter(sentence_phonemes__phoneme_id__in=weak_phoneme_ids)
                 .distinct()
-                .prefetch_related('sentence_phonemes__phoneme')
+                .prefetch_related(
+                    Prefetch('sentence_phonemes', queryset=weak_sp_qs, to_attr='weak_sps')
+                )
                 [:5]
             )
             
             for sentence in sentences:
-                target_phonemes = [
-                    sp.phoneme.arpabet
-                    for sp in sentence.sentence_phonemes.all()
-                    if sp.phoneme_id in weak_phoneme_ids
-                ]
+                target_phonemes = [sp.phoneme.arpabet for sp in sentence.weak_sps]
                 recommended_sentences.append({
                     'id': sentence.id,
                     'text': sentence.text,
@@ -920,20 +999,26 @@ class SublevelSessionView(APIView):
     Manages fixed sentence assignments per user+level+sublevel.
     
     GET:   Get-or-create — assigns 5 sentences on first call, returns them on subsequent calls.
+           Pass include_results=false to skip loading assessment_results.
     PATCH: Update current_index and/or assessment_results as user progresses.
     DELETE: Reset the sublevel session (used for "Retry Sublevel").
     """
     
     permission_classes = [IsAuthenticated]
     
-    def _get_deterministic_sentences(self, user, level, sublevel, count=5):
+    def _get_sentence_pool(self, level, sublevel):
         """
-        Get deterministic sentence selection using seeded randomization.
+        Get the candidate sentence IDs for a level/sublevel (cached).
         
-        Same user + level + sublevel combination always gets the same sentences
-        in the same order, but different sublevels get different sentences.
+        Every user starting the same sublevel needs the same pool, so it is
+        cached briefly. The key embeds a generation counter that is bumped
+        whenever a ReferenceSentence is saved or deleted (see signals.py).
         """
-        import random
+        generation = cache.get(SENTENCE_POOL_GENERATION_KEY, 0)
+        key = f"sublevel_ids:{generation}:{level}:{sublevel}"
+        sentences = cache.get(key)
+        if sentences is not None:
+            return sentences
         
         # Get all available sentences
         sentences = list(
@@ -953,20 +1038,33 @@ class SublevelSessionView(APIView):
                 ).values_list('id', flat=True)
             )
         
+        cache.set(key, sentences, SENTENCE_POOL_CACHE_TTL)
+        return sentences
+    
+    def _get_deterministic_sentences(self, user, level, sublevel, count=5):
+        """
+        Get deterministic sentence selection using seeded randomization.
+        
+        Same user + level + sublevel combination always gets the same sentences
+        in the same order, but different sublevels get different sentences.
+        """
+        import random
+        
+        sentences = self._get_sentence_pool(level, sublevel)
+        
         if not sentences:
             return []
         
-        # Use deterministic seeding: same user + level + sublevel = same selection
-        seed_string = f"{user.id}-{level}-{sublevel}"
-        random.seed(seed_string)
+        # Use deterministic seeding: same user + level + sublevel = same selection.
+        # Integer seed from a stable digest (never the salted builtin hash());
+        # a local generator keeps the global RNG untouched (thread-safe).
+        seed_digest = hashlib.blake2b(
+            f"{user.id}-{level}-{sublevel}".encode(), digest_size=8
+        ).digest()
+        rng = random.Random(int.from_bytes(seed_digest, 'little'))
         
         # Randomly select without replacement
-        selected = random.sample(sentences, min(count, len(sentences)))
-        
-        # Reset random seed to avoid side effects
-        random.seed()
-        
-        return selected
+        return rng.sample(sentences, min(count, len(sentences)))
     
     def get(self, request):
         level = request.query_params.get('level')
@@ -978,23 +1076,30 @@ class SublevelSessionView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # assessment_results can grow large; only fetch it when the client wants it
+        include_results = request.query_params.get('include_results', 'true').lower() != 'false'
+        
         # Try to get existing session
-        session = SublevelSession.objects.filter(
+        session_qs = SublevelSession.objects.filter(
             user=request.user,
             level=level,
             sublevel=sublevel
-        ).first()
+        )
+        if not include_results:
+            session_qs = session_qs.defer('assessment_results')
+        session = session_qs.first()
         
         if session:
-            # Validate that all sentence IDs still exist
-            existing_ids = set(
-                ReferenceSentence.objects.filter(
-                    id__in=session.sentence_ids, is_validated=True
-                ).values_list('id', flat=True)
-            )
-            if set(session.sentence_ids) != existing_ids:
+            # Validate that all sentence IDs still exist (single COUNT, no id transfer)
+            assigned_ids = set(session.sentence_ids)
+            valid_count = ReferenceSentence.objects.filter(
+                id__in=assigned_ids, is_validated=True
+            ).count()
+            if valid_count != len(assigned_ids):
                 # Some sentences were deleted — reassign
                 logger.warning(f"Stale sentence IDs detected, reassigning for {request.user.email}")
+                # Bulk updates bypass signals, so the cached pool may be stale too
+                bump_sentence_pool_generation()
                 session.delete()
                 session = None
         
@@ -1023,7 +1128,10 @@ class SublevelSessionView(APIView):
             
             logger.info(f"Created sublevel session for {request.user.email}: {level} L{sublevel} with {len(sentences)} sentences")
         
-        serializer = SublevelSessionSerializer(session)
+        serializer = SublevelSessionSerializer(
+            session,
+            context={'include_results': include_results}
+        )
         return Response(serializer.data)
     
     def patch(self, request):
@@ -1048,27 +1156,35 @@ class SublevelSessionView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        # Track changed columns so the UPDATE skips untouched JSON fields
+        changed_fields = []
+        
         # Update current_index if provided
         if 'current_index' in request.data:
             new_index = int(request.data['current_index'])
             if 0 <= new_index < len(session.sentence_ids):
                 session.current_index = new_index
+                changed_fields.append('current_index')
         
         # Update attempted_sentence_ids if provided
         if 'attempted_sentence_ids' in request.data:
             attempted = request.data['attempted_sentence_ids']
             if isinstance(attempted, list):
-                # Merge new attempts with existing ones
+                # Merge new attempts with existing ones (order-preserving, O(1) lookups)
                 existing = session.attempted_sentence_ids or []
-                # Add new IDs that aren't already recorded
+                seen = set(existing)
+                allowed = set(session.sentence_ids)
                 for sid in attempted:
-                    if sid not in existing and sid in session.sentence_ids:
+                    if sid in allowed and sid not in seen:
+                        seen.add(sid)
                         existing.append(sid)
                 session.attempted_sentence_ids = existing
+                changed_fields.append('attempted_sentence_ids')
         
         # Update is_completed if provided
         if 'is_completed' in request.data:
             session.is_completed = bool(request.data['is_completed'])
+            changed_fields.append('is_completed')
         
         # Update assessment_results if provided
         if 'assessment_results' in request.data:
@@ -1076,8 +1192,11 @@ class SublevelSessionView(APIView):
             results = session.assessment_results or {}
             results.update(request.data['assessment_results'])
             session.assessment_results = results
+            changed_fields.append('assessment_results')
         
-        session.save()
+        if changed_fields:
+            # auto_now fields are only refreshed when listed explicitly
+            session.save(update_fields=changed_fields + ['updated_at', 'last_active_at'])
         
         serializer = SublevelSessionSerializer(session)
         return Response(serializer.data)
@@ -14,6 +14,12 @@ Architecture principles:
 import logging
 from typing import List, Optional
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from apps.library.models import ReferenceSentence, SentencePhoneme, Phoneme
+from services.background import run_in_background
 
 logger = logging.getLogger(__name__)
 
@@ -61,8 +67,6 @@ class SentenceGenerationService:
             logger.warning("No phonemes provided for generation")
             return []
         
-        from apps.library.models import ReferenceSentence, SentencePhoneme, Phoneme
-        
         # Step 1: Query curated sentences first
         curated = self._get_curated_sentences(phonemes, difficulty, count)
         
@@ -95,24 +99,20 @@ class SentenceGenerationService:
         """
         Query existing curated sentences containing target phonemes.
         """
-        from apps.library.models import ReferenceSentence, SentencePhoneme, Phoneme
-        
-        # Get phoneme objects
-        phoneme_objs = Phoneme.objects.filter(arpabet__in=phonemes)
-        
-        if not phoneme_objs.exists():
-            return []
-        
-        # Find sentences containing these phonemes
+        # Find sentences containing these phonemes. EXISTS avoids the
+        # JOIN + DISTINCT sort, so the LIMIT can stop at the Kth match.
+        has_target_phoneme = SentencePhoneme.objects.filter(
+            sentence=OuterRef('pk'),
+            phoneme__arpabet__in=phonemes
+        )
         sentences = (
             ReferenceSentence.objects
             .filter(
-                sentence_phonemes__phoneme__in=phoneme_objs,
+                Exists(has_target_phoneme),
                 difficulty_level=difficulty,
                 source='curated',
                 is_validated=True
-            )
-            .distinct()[:count]
+            )[:count]
         )
         
         return [
@@ -173,22 +173,20 @@ class SentenceGenerationService:
         2. Embedding generation
         3. Caching
         """
-        from apps.library.models import ReferenceSentence, Phoneme, SentencePhoneme
         from nlp_core.phoneme_extractor import text_to_phonemes
-        import hashlib
         
         sentence_text = result.get('sentence')
         
         if not sentence_text:
             return None
         
-        # Check if sentence already exists (avoid duplicates)
-        existing = ReferenceSentence.objects.filter(text=sentence_text).first()
-        if existing:
-            logger.info(f"Sentence already exists: {sentence_text[:50]}")
-            return existing
-        
         try:
+            # Cheap fast path: known text skips G2P entirely
+            existing = ReferenceSentence.objects.filter(text=sentence_text).first()
+            if existing:
+                logger.info(f"Sentence already exists: {sentence_text[:50]}")
+                return existing
+            
             # Step 1: Run G2P to get phoneme sequence
             phoneme_data = text_to_phonemes(sentence_text)
             phoneme_sequence = phoneme_data.get('phonemes', [])
@@ -206,43 +204,67 @@ class SentenceGenerationService:
             }
             
             # Step 3: Save sentence to DB
-            from django.utils import timezone
+            # get_or_create covers the race with a concurrent insert of the
+            # same text since the check above: the unique constraint picks
+            # the winner and this call returns it
+            try:
+                sentence, created = ReferenceSentence.objects.get_or_create(
+                    text=sentence_text,
+                    defaults={
+                        'phoneme_sequence': phoneme_sequence,
+                        'alignment_map': [],  # Computed when reference audio is generated
+                        'difficulty_level': difficulty,
+                        'sublevel': '1',
+                        'target_phonemes': result.get('target_phonemes', []),
+                        'source': 'llm_generated',
+                        'generation_metadata': generation_metadata,
+                        'is_validated': True,
+                    },
+                )
+            except ReferenceSentence.MultipleObjectsReturned:
+                # Legacy duplicate curated rows with this text
+                sentence, created = ReferenceSentence.objects.filter(text=sentence_text).first(), False
             
-            sentence = ReferenceSentence.objects.create(
-                text=sentence_text,
-                phoneme_sequence=phoneme_sequence,
-                alignment_map=[],  # Will be computed when reference audio is generated
-                difficulty_level=difficulty,
-                sublevel='1',
-                target_phonemes=result.get('target_phonemes', []),
-                source='llm_generated',
-                generation_metadata=generation_metadata,
-                is_validated=True,
-            )
+            if not created:
+                logger.info(f"Sentence already exists: {sentence_text[:50]}")
+                return sentence
             
             # Step 4: Create SentencePhoneme junction records
+            # (one IN query for all phonemes + one bulk INSERT)
             target_words = result.get('target_words', [])
-            for phoneme_arpabet in result.get('target_phonemes', []):
-                try:
-                    phoneme = Phoneme.objects.get(arpabet=phoneme_arpabet)
-                    
-                    # Find word context (use first target word if available)
-                    word_context = target_words[0] if target_words else sentence_text.split()[0]
-                    
-                    SentencePhoneme.objects.create(
-                        sentence=sentence,
-                        phoneme=phoneme,
-                        position='medial',  # Default
-                        word_context=word_context,
-                    )
-                except Phoneme.DoesNotExist:
+            target_arpabets = result.get('target_phonemes', [])
+            phoneme_map = {
+                p.arpabet: p
+                for p in Phoneme.objects.filter(arpabet__in=target_arpabets)
+            }
+            
+            # Find word context (use first target word if available)
+            word_context = target_words[0] if target_words else sentence_text.split()[0]
+            
+            junction_rows = []
+            for phoneme_arpabet in target_arpabets:
+                phoneme = phoneme_map.get(phoneme_arpabet)
+                if not phoneme:
                     logger.warning(f"Phoneme not found: {phoneme_arpabet}")
+                    continue
+                junction_rows.append(SentencePhoneme(
+                    sentence=sentence,
+                    phoneme=phoneme,
+                    position='medial',  # Default
+                    word_context=word_context,
+                ))
+            
+            if junction_rows:
+                SentencePhoneme.objects.bulk_create(junction_rows)
             
             logger.info(f"Saved generated sentence: {sentence.id}")
             
-            # Step 5: Optionally generate TTS audio in background
-            # This ensures embeddings can be precomputed
-            self._trigger_tts_generation(sentence)
+            # Step 5: Generate TTS audio + embeddings in background, after the
+            # INSERT commits, so the request returns at G2P + insert time
+            sentence_id = sentence.id
+            transaction.on_commit(
+                lambda: run_in_background(self._tts_and_embed, sentence_id)
+            )
             
             return sentence
             
@@ -250,6 +272,14 @@ class SentenceGenerationService:
             logger.error(f"Failed to save generated sentence: {str(e)}")
             return None
     
+    def _tts_and_embed(self, sentence_id):
+        """Background task: reload the sentence and generate TTS + embeddings."""
+        sentence = ReferenceSentence.objects.filter(id=sentence_id).first()
+        if sentence is None:
+            logger.warning(f"Sentence {sentence_id} vanished before TTS generation")
+            return
+        self._trigger_tts_generation(sentence)
+    
     def _trigger_tts_generation(self, sentence):
         """
         Trigger TTS audio generation for the sentence (background task).
@@ -286,7 +316,7 @@ class SentenceGenerationService:
         """
         try:
             from nlp_core.vectorizer import compute_sentence_embedding
-            import pickle
+            from apps.practice.services import AssessmentService
             
             audio_path = sentence.get_audio_source()
             if not audio_path:
@@ -297,8 +327,9 @@ class SentenceGenerationService:
             embeddings = compute_sentence_embedding(audio_path)
             
             if embeddings is not None:
-                # Serialize and cache
-                sentence.reference_embeddings = pickle.dumps(embeddings)
+                # Serialize as raw float32 bytes + shape header (no pickle);
+                # same format AssessmentService reads back with np.frombuffer
+                sentence.reference_embeddings = AssessmentService._serialize_embeddings([embeddings])
                 sentence.save(update_fields=['reference_embeddings'])
                 
                 logger.info(f"Embeddings cached for sentence {sentence.id}")
@@ -4,10 +4,18 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
 
-from apps.library.models import SentencePhoneme, ReferenceSentence, Phoneme
+from django.db.models import Count, Q
 
-sentence_phoneme_count = SentencePhoneme.objects.count()
-sentence_count = ReferenceSentence.objects.filter(is_validated=True).count()
+from apps.library.models import ReferenceSentence, Phoneme
+
+# One round-trip for both sentence-side counts (distinct: the junction
+# LEFT JOIN repeats each sentence once per SentencePhoneme row)
+stats = ReferenceSentence.objects.aggregate(
+    sentence_phonemes=Count('sentence_phonemes'),
+    validated_sentences=Count('pk', filter=Q(is_validated=True), distinct=True),
+)
+sentence_phoneme_count = stats['sentence_phonemes']
+sentence_count = stats['validated_sentences']
 phoneme_count = Phoneme.objects.count()
 
 print(f"SentencePhoneme entries: {sentence_phoneme_count}")
@@ -22,8 +30,6 @@ else:
     print(f"\n✅ SentencePhoneme table has {sentence_phoneme_count} entries")
     
     # Test a query similar to what the view does
-    from django.db.models import Count, Q
-    
     test_phonemes = ['T', 'IH1', 'M']  # Example weak phonemes
     results = (
         ReferenceSentence.objects
@@ -40,4 +46,9 @@ else:
         .order_by('-weak_phoneme_count')
         .distinct()[:5]
     )
-    print(f"\nTest query returned: {results.count()} sentences")
+    # Stream rows instead of filling the queryset result cache
+    returned = 0
+    for sentence in results.iterator(chunk_size=1000):
+        print(f"  - {sentence.id}: {sentence.weak_phoneme_count} weak phonemes")
+        returned += 1
+    print(f"\nTest query returned: {returned} sentences")
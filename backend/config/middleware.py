@@ -0,0 +1,25 @@
+"""
+Project-level middleware for Pronunex.
+"""
+
+from django.http import JsonResponse
+
+
+class HealthCheckMiddleware:
+    """
+    Answers liveness probes at /health/ before any other middleware runs.
+    
+    Render and uptime monitors poll this every few seconds; short-circuiting
+    here skips CORS, session, CSRF, auth and URL resolution for each probe.
+    Must be the first entry in MIDDLEWARE.
+    """
+    
+    HEALTH_PATH = '/health/'
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        if request.path == self.HEALTH_PATH:
+            return JsonResponse({'status': 'healthy'})
+        return self.get_response(request)
@@ -46,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'config.middleware.HealthCheckMiddleware',  # Must stay first: short-circuits /health/
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -237,6 +238,10 @@ CORS_ALLOW_HEADERS = list(default_headers) + [
 GROQ_API_KEY = os.getenv('GROQ_API_KEY', '')
 CEREBRAS_API_KEY = os.getenv('CEREBRAS_API_KEY', '')
 
+# ASR transcription cache, keyed by audio content hash (opt-in: PRONUNEX_CACHE=1)
+ASR_CACHE_ENABLED = os.getenv('PRONUNEX_CACHE', '0') == '1'
+ASR_CACHE_TTL = int(os.getenv('ASR_CACHE_TTL', '86400'))
+
 # Pronunciation Scoring Configuration
 SCORING_CONFIG = {
     'WEAK_PHONEME_THRESHOLD': 0.85,  # Phonemes below this are flagged for improvement
@@ -245,6 +250,8 @@ SCORING_CONFIG = {
     'EMBEDDING_DIM': 768,           # Wav2Vec2 embedding dimension
     'SAMPLE_RATE': 16000,           # Audio sample rate
     'SILENCE_TRIM_DB': 20,          # dB threshold for silence trimming
+    'NUMBA_DTW': False,             # Word DTW via the Numba kernel instead of dtwalign
+                                    # (requires `pip install numba`; ignored without it)
 }
 
 # Logging Configuration
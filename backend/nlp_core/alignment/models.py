@@ -5,6 +5,8 @@ Handles singleton model loading for alignment models.
 """
 
 import logging
+import threading
+
 import torch
 import torchaudio
 
@@ -14,6 +16,7 @@ logger = logging.getLogger(__name__)
 _aligner_bundle = None
 _aligner_model = None
 _aligner_tokenizer = None
+_aligner_lock = threading.Lock()
 
 
 def get_forced_alignment_model():
@@ -28,31 +31,40 @@ def get_forced_alignment_model():
     global _aligner_bundle, _aligner_model, _aligner_tokenizer
     
     if _aligner_model is None:
-        logger.info("Loading forced alignment model...")
-        
-        try:
-            # Try MMS_FA bundle (torchaudio >= 2.1)
-            _aligner_bundle = torchaudio.pipelines.MMS_FA
-            _aligner_model = _aligner_bundle.get_model()
-            _aligner_tokenizer = _aligner_bundle.get_tokenizer()
-            _aligner_model.eval()
-            logger.info("MMS_FA forced alignment model loaded")
-            
-        except AttributeError:
-            # Fallback: wav2vec2 base model for older versions
-            logger.warning("MMS_FA unavailable, using wav2vec2 fallback")
-            _aligner_bundle = None
-            
-            from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
-            
-            _aligner_model = Wav2Vec2ForCTC.from_pretrained(
-                "facebook/wav2vec2-base-960h"
-            )
-            _aligner_tokenizer = Wav2Vec2Processor.from_pretrained(
-                "facebook/wav2vec2-base-960h"
-            )
-            _aligner_model.eval()
-            logger.info("Wav2Vec2 fallback model loaded")
+        # Locked: the startup pre-warm thread and an early request must not
+        # both load the weights
+        with _aligner_lock:
+            if _aligner_model is None:
+                logger.info("Loading forced alignment model...")
+                
+                try:
+                    # Try MMS_FA bundle (torchaudio >= 2.1)
+                    bundle = torchaudio.pipelines.MMS_FA
+                    model = bundle.get_model()
+                    tokenizer = bundle.get_tokenizer()
+                    model.eval()
+                    logger.info("MMS_FA forced alignment model loaded")
+                    
+                except AttributeError:
+                    # Fallback: wav2vec2 base model for older versions
+                    logger.warning("MMS_FA unavailable, using wav2vec2 fallback")
+                    bundle = None
+                    
+                    from transformers import Wav2Vec2ForCTC, Wav2Vec2Processor
+                    
+                    model = Wav2Vec2ForCTC.from_pretrained(
+                        "facebook/wav2vec2-base-960h",
+                        low_cpu_mem_usage=True,
+                    )
+                    tokenizer = Wav2Vec2Processor.from_pretrained(
+                        "facebook/wav2vec2-base-960h"
+                    )
+                    model.eval()
+                    logger.info("Wav2Vec2 fallback model loaded")
+                
+                # Publish the model last: it's the unlocked readiness check
+                _aligner_bundle, _aligner_tokenizer = bundle, tokenizer
+                _aligner_model = model
     
     return _aligner_bundle, _aligner_model, _aligner_tokenizer
 
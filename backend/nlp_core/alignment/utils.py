@@ -5,6 +5,7 @@ Common utilities used across alignment modules.
 """
 
 import logging
+import threading
 from typing import Tuple, List, Dict
 from dataclasses import dataclass
 import torch
@@ -12,6 +13,11 @@ import torchaudio
 
 logger = logging.getLogger(__name__)
 
+# Resample transforms keyed by (orig_freq, new_freq). Building one computes
+# the sinc filter kernel, so reuse it for every file at the same rate.
+_resampler_cache: Dict[Tuple[int, int], torchaudio.transforms.Resample] = {}
+_resampler_lock = threading.Lock()
+
 
 @dataclass
 class AlignedToken:
@@ -22,6 +28,23 @@ class AlignedToken:
     score: float = 1.0
 
 
+def get_resampler(orig_freq: int, new_freq: int = 16000) -> torchaudio.transforms.Resample:
+    """Get a cached Resample transform for this rate pair (kernel built once)."""
+    key = (int(orig_freq), int(new_freq))
+    resampler = _resampler_cache.get(key)
+    if resampler is None:
+        with _resampler_lock:
+            resampler = _resampler_cache.get(key)
+            if resampler is None:
+                resampler = torchaudio.transforms.Resample(
+                    orig_freq=key[0],
+                    new_freq=key[1],
+                    dtype=torch.float32
+                )
+                _resampler_cache[key] = resampler
+    return resampler
+
+
 def load_audio(
     audio_path: str, 
     target_sample_rate: int = 16000
@@ -44,11 +67,7 @@ def load_audio(
     
     # Resample if needed
     if sample_rate != target_sample_rate:
-        resampler = torchaudio.transforms.Resample(
-            orig_freq=sample_rate,
-            new_freq=target_sample_rate
-        )
-        waveform = resampler(waveform)
+        waveform = get_resampler(sample_rate, target_sample_rate)(waveform)
         sample_rate = target_sample_rate
     
     return waveform, sample_rate
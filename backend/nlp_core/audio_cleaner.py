@@ -130,9 +130,10 @@ def normalize_audio(y: np.ndarray) -> np.ndarray:
     Returns:
         np.ndarray: Normalized audio
     """
-    max_val = np.max(np.abs(y))
+    # Peak via two reductions (no |y| temporary), then one scaled output
+    max_val = max(float(y.max()), -float(y.min()))
     if max_val > 0:
-        return y / max_val * 0.95  # Leave 5% headroom
+        return y * (0.95 / max_val)  # Leave 5% headroom
     return y
 
 
@@ -0,0 +1,80 @@
+"""
+DTW Module for Pronunex.
+
+Dynamic Time Warping over a precomputed distance matrix, used for word
+alignment when SCORING_CONFIG['NUMBA_DTW'] is on. Word matrices are small
+(tens of rows and columns), so the whole cost is per-cell interpreter
+overhead; with Numba the kernel compiles to a tight native loop.
+Numba is optional: without it dtw_warping_path is None.
+"""
+
+import numpy as np
+
+# Optional: JIT-compile the kernel (cached on disk after the first call)
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _dtw_warping_path(cost: np.ndarray) -> np.ndarray:
+    """
+    Symmetric2 DTW from (0, 0) to (n-1, m-1) and its warping path.
+
+    Mirrors dtwalign's dtw_from_distance_matrix(cost).get_warping_path():
+    steps (1, 0) and (0, 1) weigh the cell once, (1, 1) twice; the way back
+    moves to the predecessor with the lowest cumulative cost, preferring
+    (i-1, j), then (i-1, j-1), then (i, j-1) on ties.
+
+    Args:
+        cost: float64 distance matrix, shape (n, m); rows are the query
+
+    Returns:
+        np.ndarray: int64, for each column the last (highest) query row
+        aligned to it; column 0 always maps to row 0
+    """
+    n, m = cost.shape
+    acc = np.full((n, m), np.inf)
+    acc[0, 0] = cost[0, 0]
+
+    for i in range(n):
+        for j in range(m):
+            if i == 0 and j == 0:
+                continue
+            d = cost[i, j]
+            best = np.inf
+            if i > 0:
+                best = acc[i - 1, j] + d
+            if i > 0 and j > 0 and acc[i - 1, j - 1] + 2.0 * d < best:
+                best = acc[i - 1, j - 1] + 2.0 * d
+            if j > 0 and acc[i, j - 1] + d < best:
+                best = acc[i, j - 1] + d
+            acc[i, j] = best
+
+    # Walk back to the origin; the first row reached in a column is the
+    # last one aligned to it going forward, and that is the one kept
+    path = np.full(m, -1, dtype=np.int64)
+    i, j = n - 1, m - 1
+    path[j] = i
+    while i > 0 or j > 0:
+        up = acc[i - 1, j] if i > 0 else np.inf
+        diag = acc[i - 1, j - 1] if i > 0 and j > 0 else np.inf
+        left = acc[i, j - 1] if j > 0 else np.inf
+        if up <= diag and up <= left:
+            i -= 1
+        elif diag <= left:
+            i -= 1
+            j -= 1
+        else:
+            j -= 1
+        if path[j] < 0:
+            path[j] = i
+
+    path[0] = 0
+    return path
+
+
+if njit is not None:
+    dtw_warping_path = njit(cache=True)(_dtw_warping_path)
+else:
+    dtw_warping_path = None
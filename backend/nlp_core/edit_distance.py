@@ -8,46 +8,254 @@ Ported from ai-pronunciation-trainer project with enhancements.
 import numpy as np
 from typing import List, Tuple, Optional
 
+# C implementation (bit-parallel); pure-Python DP below is the fallback
+try:
+    from rapidfuzz.distance import Levenshtein as _RFLevenshtein
+    from rapidfuzz.process import cdist as _rf_cdist
+except ImportError:
+    _RFLevenshtein = None
+    _rf_cdist = None
 
-def edit_distance(seq1: str, seq2: str) -> int:
+# Element-wise batch distances (rapidfuzz >= 3.6)
+try:
+    from rapidfuzz.process import cpdist as _rf_cpdist
+except ImportError:
+    _rf_cpdist = None
+
+# Shorter-sequence length up to which the pure-Python fallback uses Myers'
+# bit-vector algorithm (the pattern fits one 64-bit word)
+MYERS_MAX_PATTERN = 64
+
+# Largest DP matrix (cells) the fallback backtrace fills in plain Python;
+# above this the per-row NumPy fill wins
+SMALL_DP_MAX_CELLS = 4096
+
+
+def edit_distance(seq1: str, seq2: str, score_cutoff: Optional[int] = None) -> int:
     """
     Calculate Levenshtein edit distance between two sequences.
     
     Args:
         seq1: First sequence (string or list)
         seq2: Second sequence (string or list)
+        score_cutoff: If given, distances above it are reported as
+            score_cutoff + 1, letting clearly unrelated pairs exit early
     
     Returns:
         int: Minimum number of edits (insertions, deletions, substitutions)
     """
-    size_x = len(seq1) + 1
-    size_y = len(seq2) + 1
-    
-    matrix = np.zeros((size_x, size_y), dtype=int)
-    
-    # Initialize first row and column
-    for x in range(size_x):
-        matrix[x, 0] = x
-    for y in range(size_y):
-        matrix[0, y] = y
-    
-    # Fill the matrix
-    for x in range(1, size_x):
-        for y in range(1, size_y):
-            if seq1[x - 1] == seq2[y - 1]:
-                matrix[x, y] = min(
-                    matrix[x - 1, y] + 1,      # Deletion
-                    matrix[x - 1, y - 1],      # Match (no cost)
-                    matrix[x, y - 1] + 1       # Insertion
-                )
-            else:
-                matrix[x, y] = min(
-                    matrix[x - 1, y] + 1,      # Deletion
-                    matrix[x - 1, y - 1] + 1,  # Substitution
-                    matrix[x, y - 1] + 1       # Insertion
-                )
+    if _RFLevenshtein is not None:
+        return _RFLevenshtein.distance(seq1, seq2, score_cutoff=score_cutoff)
+    
+    if score_cutoff is not None:
+        if abs(len(seq1) - len(seq2)) > score_cutoff:
+            return score_cutoff + 1
+        if min(len(seq1), len(seq2)) > MYERS_MAX_PATTERN:
+            return _banded_edit_distance(seq1, seq2, score_cutoff)
+        return min(edit_distance(seq1, seq2), score_cutoff + 1)
+    
+    # Keep the shorter sequence on the inner axis: O(min(N, M)) memory
+    if len(seq1) < len(seq2):
+        seq1, seq2 = seq2, seq1
+    
+    # Words and short sentences: one pass of bitwise ops per character
+    if len(seq2) <= MYERS_MAX_PATTERN:
+        return _myers_edit_distance(seq2, seq1)
+    
+    # Longer inputs: one rolling DP row, each updated with whole-row NumPy ops
+    dtype = _dp_dtype(seq1, seq2)
+    seq2_arr = np.array(list(seq2), dtype=object if not isinstance(seq2, str) else None)
+    offsets = np.arange(len(seq2) + 1, dtype=dtype)
+    
+    row = offsets
+    for x in range(1, len(seq1) + 1):
+        row = _dp_next_row(row, seq1[x - 1], seq2_arr, offsets, x)
+    
+    return int(row[-1])
+
+
+def edit_distance_matrix(
+    seqs1: List[str],
+    seqs2: List[str],
+    score_cutoff: Optional[int] = None
+) -> np.ndarray:
+    """
+    Pairwise edit distances between two lists of sequences.
+    
+    Args:
+        seqs1: Sequences for the rows
+        seqs2: Sequences for the columns
+        score_cutoff: If given, distances above it are reported as
+            score_cutoff + 1 (see edit_distance)
+    
+    Returns:
+        np.ndarray: int32 matrix of shape (len(seqs1), len(seqs2))
+    """
+    if _rf_cdist is not None:
+        # Whole matrix in one C++ call (bit-parallel Levenshtein)
+        return _rf_cdist(
+            seqs1, seqs2,
+            scorer=_RFLevenshtein.distance,
+            score_cutoff=score_cutoff,
+            dtype=np.int32
+        )
+    
+    matrix = np.empty((len(seqs1), len(seqs2)), dtype=np.int32)
+    for i, seq1 in enumerate(seqs1):
+        row = matrix[i]
+        for j, seq2 in enumerate(seqs2):
+            row[j] = edit_distance(seq1, seq2, score_cutoff)
+    return matrix
+
+
+def edit_distance_pairs(
+    seqs1: List[str],
+    seqs2: List[str],
+    score_cutoff: Optional[int] = None
+) -> np.ndarray:
+    """
+    Edit distance of each seqs1[i] to seqs2[i].
+    
+    Args:
+        seqs1: First sequence of each pair
+        seqs2: Second sequence of each pair (same length as seqs1)
+        score_cutoff: If given, distances above it are reported as
+            score_cutoff + 1 (see edit_distance)
+    
+    Returns:
+        np.ndarray: int32 distances, one per pair
+    """
+    if _rf_cpdist is not None:
+        return _rf_cpdist(
+            seqs1, seqs2,
+            scorer=_RFLevenshtein.distance,
+            score_cutoff=score_cutoff,
+            dtype=np.int32
+        )
+    
+    return np.fromiter(
+        (edit_distance(seq1, seq2, score_cutoff) for seq1, seq2 in zip(seqs1, seqs2)),
+        dtype=np.int32,
+        count=len(seqs1)
+    )
+
+
+def _myers_edit_distance(pattern, text) -> int:
+    """
+    Levenshtein distance via Myers' bit-parallel algorithm (Hyyrö's variant).
+    
+    Each DP column is encoded as vertical +1/-1 delta bit-vectors over the
+    pattern, so a whole column is updated with a handful of integer ops per
+    text character: O(len(text)) steps instead of O(N*M) cells.
+    
+    Args:
+        pattern: Shorter sequence (at most MYERS_MAX_PATTERN elements)
+        text: Longer sequence
+    """
+    m = len(pattern)
+    if m == 0:
+        return len(text)
+    
+    # Match masks: bit i set where pattern[i] == symbol
+    peq = {}
+    for i, symbol in enumerate(pattern):
+        peq[symbol] = peq.get(symbol, 0) | (1 << i)
+    
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv = mask  # Vertical +1 deltas (column 0 is 0, 1, ..., m)
+    mv = 0     # Vertical -1 deltas
+    score = m
+    
+    for symbol in text:
+        eq = peq.get(symbol, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        # Row 0 of the DP grows by one per text character
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    
+    return score
+
+
+def edit_distance_bounded(seq1: str, seq2: str, max_k: int = 32) -> int:
+    """
+    Levenshtein distance using a diagonal band (Ukkonen / Sakoe-Chiba style).
+    
+    Only cells with |i - j| <= k are filled, so near-matches (the common ASR
+    case) cost O(N*k) instead of O(N*M). If the distance exceeds k the band
+    is doubled and the DP re-run, so the result is always exact.
+    
+    Args:
+        seq1: First sequence (string or list)
+        seq2: Second sequence (string or list)
+        max_k: Initial band half-width
+    
+    Returns:
+        int: Exact edit distance
+    """
+    if _RFLevenshtein is not None:
+        return _RFLevenshtein.distance(seq1, seq2)
+    
+    if min(len(seq1), len(seq2)) <= MYERS_MAX_PATTERN:
+        return edit_distance(seq1, seq2)
     
-    return int(matrix[size_x - 1, size_y - 1])
+    longest = max(len(seq1), len(seq2))
+    k = max(1, max_k, abs(len(seq1) - len(seq2)))
+    while True:
+        if k >= longest:
+            return edit_distance(seq1, seq2)
+        distance = _banded_edit_distance(seq1, seq2, k)
+        if distance <= k:
+            return distance
+        k *= 2
+
+
+def edit_distance_within(seq1: str, seq2: str, max_edits: int) -> bool:
+    """
+    Whether the edit distance is at most max_edits, without computing it exactly.
+    
+    Uses a band of half-width max_edits, so clearly unrelated sequences are
+    rejected in O(N*k) (or immediately, when the lengths alone differ by more).
+    """
+    if _RFLevenshtein is not None:
+        return _RFLevenshtein.distance(seq1, seq2, score_cutoff=max_edits) <= max_edits
+    
+    if abs(len(seq1) - len(seq2)) > max_edits:
+        return False
+    return _banded_edit_distance(seq1, seq2, max_edits) <= max_edits
+
+
+def _banded_edit_distance(seq1, seq2, k: int) -> int:
+    """Band-limited DP; exact when the result is <= k, else returns k + 1."""
+    n, m = len(seq1), len(seq2)
+    out_of_band = k + 1
+    
+    prev = [j if j <= k else out_of_band for j in range(m + 1)]
+    for i in range(1, n + 1):
+        curr = [out_of_band] * (m + 1)
+        if i <= k:
+            curr[0] = i
+        c1 = seq1[i - 1]
+        for j in range(max(1, i - k), min(m, i + k) + 1):
+            cost = 0 if c1 == seq2[j - 1] else 1
+            value = prev[j - 1] + cost
+            if prev[j] + 1 < value:
+                value = prev[j] + 1
+            if curr[j - 1] + 1 < value:
+                value = curr[j - 1] + 1
+            curr[j] = value if value < out_of_band else out_of_band
+        prev = curr
+    
+    return prev[m]
 
 
 def edit_distance_normalized(seq1: str, seq2: str) -> float:
@@ -76,6 +284,120 @@ def edit_distance_similarity(seq1: str, seq2: str) -> float:
     return 1.0 - edit_distance_normalized(seq1, seq2)
 
 
+def _dp_dtype(seq1, seq2):
+    """Smallest safe cell type: int16 halves memory traffic vs int64."""
+    return np.int16 if max(len(seq1), len(seq2)) < np.iinfo(np.int16).max // 2 else np.int32
+
+
+def _dp_next_row(prev_row, symbol, seq2_arr, offsets, row_index):
+    """
+    Compute DP row i from row i-1 with whole-row NumPy ops.
+    
+    Substitution and deletion only read the previous row, so they vectorize
+    directly. The insertion chain curr[j] = min(tmp[j], curr[j-1] + 1) is a
+    running minimum of (tmp - j), shifted back by j.
+    """
+    tmp = np.empty_like(prev_row)
+    tmp[0] = row_index
+    # Substitution / match (diagonal) vs deletion (from above)
+    np.minimum(
+        prev_row[:-1] + (seq2_arr != symbol),
+        prev_row[1:] + 1,
+        out=tmp[1:]
+    )
+    # Insertion (from the left) as a prefix minimum
+    return np.minimum.accumulate(tmp - offsets) + offsets
+
+
+# Edit operation codes (also the 2-bit backtrace codes, in the backtrack's
+# priority order); get_edit_op_codes returns these
+OP_MATCH, OP_SUBSTITUTE, OP_DELETE, OP_INSERT = 0, 1, 2, 3
+_OP_NAMES = ('match', 'substitute', 'delete', 'insert')
+
+
+def _edit_backtrace(seq1, seq2) -> List[int]:
+    """
+    Backtrace of 2-bit step codes, one packed int per DP row.
+    
+    Only two DP rows are live at a time; each cell keeps just the step the
+    backtrack would take from it (match, else substitute, else delete, else
+    insert). Cell (x, y) is (rows[x] >> 2*y) & 3, so the working set is one
+    row of ints plus a quarter byte per cell instead of a full int matrix.
+    
+    Word-sized inputs (letters of one word) use a plain-Python fill: per-row
+    NumPy dispatch costs more than the whole matrix at that size.
+    """
+    if (len(seq1) + 1) * (len(seq2) + 1) <= SMALL_DP_MAX_CELLS:
+        return _edit_backtrace_small(seq1, seq2)
+    
+    dtype = _dp_dtype(seq1, seq2)
+    seq2_arr = np.array(list(seq2), dtype=object if not isinstance(seq2, str) else None)
+    offsets = np.arange(len(seq2) + 1, dtype=dtype)
+    
+    padded_cols = (len(seq2) + 1 + 3) // 4 * 4
+    codes = np.full(padded_cols, OP_INSERT, dtype=np.uint8)
+    
+    def pack(row_codes):
+        # Four codes per byte, little-endian: column y lands at bit 2*y
+        c = row_codes.reshape(-1, 4)
+        packed = c[:, 0] | (c[:, 1] << 2) | (c[:, 2] << 4) | (c[:, 3] << 6)
+        return int.from_bytes(packed.tobytes(), 'little')
+    
+    rows = [pack(codes)]  # first row: insertions only
+    prev_row = offsets
+    for x in range(1, len(seq1) + 1):
+        curr_row = _dp_next_row(prev_row, seq1[x - 1], seq2_arr, offsets, x)
+        codes[0] = OP_DELETE  # first column: deletions only
+        codes[1:len(seq2) + 1] = np.where(
+            seq2_arr == seq1[x - 1], OP_MATCH,
+            np.where(curr_row[1:] == prev_row[:-1] + 1, OP_SUBSTITUTE,
+                     np.where(curr_row[1:] == prev_row[1:] + 1, OP_DELETE, OP_INSERT))
+        )
+        rows.append(pack(codes))
+        prev_row = curr_row
+    return rows
+
+
+def _edit_backtrace_small(seq1, seq2) -> List[int]:
+    """Plain-Python fill of _edit_backtrace for small matrices (same codes)."""
+    n = len(seq2)
+    all_insert = 0
+    for y in range(1, n + 1):
+        all_insert |= OP_INSERT << (y << 1)
+    rows = [all_insert]  # first row: insertions only
+    
+    prev_row = list(range(n + 1))
+    for x in range(1, len(seq1) + 1):
+        symbol = seq1[x - 1]
+        curr_row = [x] * (n + 1)
+        row_bits = OP_DELETE  # first column: deletions only
+        for y in range(1, n + 1):
+            diagonal = prev_row[y - 1]
+            if symbol == seq2[y - 1]:
+                value = diagonal
+                code = OP_MATCH
+            else:
+                value = diagonal + 1
+                code = OP_SUBSTITUTE
+            if prev_row[y] + 1 < value:
+                value = prev_row[y] + 1
+            if curr_row[y - 1] + 1 < value:
+                value = curr_row[y - 1] + 1
+            curr_row[y] = value
+            # Same priority as the vectorized fill: match, sub, delete, insert
+            if code != OP_MATCH:
+                if value == diagonal + 1:
+                    code = OP_SUBSTITUTE
+                elif value == prev_row[y] + 1:
+                    code = OP_DELETE
+                else:
+                    code = OP_INSERT
+            row_bits |= code << (y << 1)
+        rows.append(row_bits)
+        prev_row = curr_row
+    return rows
+
+
 def get_edit_operations(seq1: str, seq2: str) -> List[dict]:
     """
     Get list of edit operations to transform seq1 into seq2.
@@ -84,69 +406,84 @@ def get_edit_operations(seq1: str, seq2: str) -> List[dict]:
         List of operations: [{'type': 'match|insert|delete|substitute', 
                               'position': int, 'char1': str, 'char2': str}]
     """
-    size_x = len(seq1) + 1
-    size_y = len(seq2) + 1
+    return [
+        {
+            'type': _OP_NAMES[code],
+            'position': x,
+            'char1': seq1[x] if code != OP_INSERT else None,
+            'char2': seq2[y] if code != OP_DELETE else None
+        }
+        for code, x, y in _edit_steps(seq1, seq2)
+    ]
+
+
+def get_edit_op_codes(seq1: str, seq2: str) -> List[Tuple[int, Optional[str]]]:
+    """
+    Compact form of get_edit_operations for hot loops.
     
-    # Build the DP matrix
-    matrix = np.zeros((size_x, size_y), dtype=int)
-    for x in range(size_x):
-        matrix[x, 0] = x
-    for y in range(size_y):
-        matrix[0, y] = y
+    Returns:
+        List of (op_code, seq2 element or None) tuples, op_code being one of
+        OP_MATCH, OP_SUBSTITUTE, OP_DELETE, OP_INSERT
+    """
+    return [
+        (code, seq2[y] if code != OP_DELETE else None)
+        for code, _, y in _edit_steps(seq1, seq2)
+    ]
+
+
+def _edit_steps(seq1, seq2) -> List[Tuple[int, int, int]]:
+    """
+    Optimal alignment as (op_code, x, y) steps in forward order.
     
-    for x in range(1, size_x):
-        for y in range(1, size_y):
-            if seq1[x - 1] == seq2[y - 1]:
-                matrix[x, y] = matrix[x - 1, y - 1]
-            else:
-                matrix[x, y] = min(
-                    matrix[x - 1, y] + 1,
-                    matrix[x - 1, y - 1] + 1,
-                    matrix[x, y - 1] + 1
-                )
+    x and y are the indices of the next unconsumed seq1 / seq2 elements.
+    With rapidfuzz the edits come from its editops and the matches between
+    them are synthesized by walking both sequences in step; otherwise they
+    are backtracked from the packed trace.
+    """
+    steps = []
+    
+    if _RFLevenshtein is not None:
+        x = y = 0
+        for tag, src_pos, _ in _RFLevenshtein.editops(seq1, seq2).as_list():
+            while x < src_pos:
+                steps.append((OP_MATCH, x, y))
+                x += 1
+                y += 1
+            if tag == 'replace':
+                steps.append((OP_SUBSTITUTE, x, y))
+                x += 1
+                y += 1
+            elif tag == 'delete':
+                steps.append((OP_DELETE, x, y))
+                x += 1
+            else:  # insert
+                steps.append((OP_INSERT, x, y))
+                y += 1
+        while x < len(seq1):
+            steps.append((OP_MATCH, x, y))
+            x += 1
+            y += 1
+        return steps
+    
+    # Forward pass over two rolling rows, recording packed backtrace codes
+    rows = _edit_backtrace(seq1, seq2)
     
     # Backtrack to find operations
-    operations = []
     x, y = len(seq1), len(seq2)
     
     while x > 0 or y > 0:
-        if x > 0 and y > 0 and seq1[x - 1] == seq2[y - 1]:
-            operations.append({
-                'type': 'match',
-                'position': x - 1,
-                'char1': seq1[x - 1],
-                'char2': seq2[y - 1]
-            })
+        code = (rows[x] >> (y << 1)) & 3
+        if code == OP_MATCH or code == OP_SUBSTITUTE:
             x -= 1
             y -= 1
-        elif x > 0 and y > 0 and matrix[x, y] == matrix[x - 1, y - 1] + 1:
-            operations.append({
-                'type': 'substitute',
-                'position': x - 1,
-                'char1': seq1[x - 1],
-                'char2': seq2[y - 1]
-            })
-            x -= 1
-            y -= 1
-        elif x > 0 and matrix[x, y] == matrix[x - 1, y] + 1:
-            operations.append({
-                'type': 'delete',
-                'position': x - 1,
-                'char1': seq1[x - 1],
-                'char2': None
-            })
+        elif code == OP_DELETE:
             x -= 1
         else:
-            operations.append({
-                'type': 'insert',
-                'position': x,
-                'char1': None,
-                'char2': seq2[y - 1]
-            })
             y -= 1
+        steps.append((code, x, y))
     
-    operations.reverse()
-    return operations
+    steps.reverse()
+    return steps
 
 
 def calculate_word_accuracy(expected: str, actual: str) -> float:
@@ -168,7 +505,11 @@ def calculate_word_accuracy(expected: str, actual: str) -> float:
     expected_clean = expected.lower().strip()
     actual_clean = actual.lower().strip()
     
-    distance = edit_distance(expected_clean, actual_clean)
+    distance = edit_distance_bounded(
+        expected_clean,
+        actual_clean,
+        max_k=max(5, abs(len(expected_clean) - len(actual_clean)) + 3)
+    )
     max_len = max(len(expected_clean), len(actual_clean))
     
     if max_len == 0:
@@ -178,35 +519,50 @@ def calculate_word_accuracy(expected: str, actual: str) -> float:
     return max(0.0, accuracy)
 
 
-def calculate_phoneme_accuracy(expected_phonemes: List[str], actual_phonemes: List[str]) -> Tuple[float, dict]:
+def calculate_phoneme_accuracy(
+    expected_phonemes: List[str],
+    actual_phonemes: List[str],
+    detailed: bool = True
+) -> Tuple[float, Optional[dict]]:
     """
     Calculate phoneme-level accuracy using edit distance.
     
     Args:
         expected_phonemes: List of expected ARPAbet phonemes
         actual_phonemes: List of actual phonemes from ASR
+        detailed: If False, skip the per-type breakdown (one distance call only)
     
     Returns:
-        Tuple of (accuracy %, breakdown dict)
+        Tuple of (accuracy %, breakdown dict or None when detailed=False)
     """
     if not expected_phonemes:
+        if not detailed:
+            return 0.0, None
         return 0.0, {'substitutions': 0, 'deletions': 0, 'insertions': 0}
     
     # Join phonemes with separator for comparison
     expected_str = ' '.join(expected_phonemes)
     actual_str = ' '.join(actual_phonemes)
     
-    operations = get_edit_operations(expected_str, actual_str)
-    
-    substitutions = sum(1 for op in operations if op['type'] == 'substitute')
-    deletions = sum(1 for op in operations if op['type'] == 'delete')
-    insertions = sum(1 for op in operations if op['type'] == 'insert')
-    
-    total_errors = substitutions + deletions + insertions
+    # Under unit costs the distance equals subs + dels + ins
+    total_errors = edit_distance(expected_str, actual_str)
     total_expected = len(expected_phonemes)
     
     accuracy = max(0.0, (1 - total_errors / total_expected) * 100) if total_expected > 0 else 0.0
     
+    if not detailed:
+        return accuracy, None
+    
+    # Breakdown needs an alignment: tally edit tags without building op dicts
+    if _RFLevenshtein is not None:
+        tags = [op[0] for op in _RFLevenshtein.editops(expected_str, actual_str).as_list()]
+        substitutions = tags.count('replace')
+    else:
+        tags = [op['type'] for op in get_edit_operations(expected_str, actual_str)]
+        substitutions = tags.count('substitute')
+    deletions = tags.count('delete')
+    insertions = tags.count('insert')
+    
     return accuracy, {
         'substitutions': substitutions,
         'deletions': deletions,
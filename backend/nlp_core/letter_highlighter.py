@@ -7,18 +7,35 @@ Ported from ai-pronunciation-trainer project with enhancements.
 """
 
 import logging
+from array import array
+from functools import lru_cache
+from itertools import chain, repeat
 from typing import List, Dict, Tuple, Optional
 from string import punctuation
 from dataclasses import dataclass
 
-from .edit_distance import edit_distance, get_edit_operations
+from .edit_distance import edit_distance, get_edit_op_codes
+
+try:
+    from rapidfuzz.distance import Levenshtein as _RFLevenshtein
+except ImportError:
+    _RFLevenshtein = None
 
 logger = logging.getLogger(__name__)
 
+# Deletion table for str.translate: strips punctuation in C, not a genexpr
+_PUNCT_TBL = str.maketrans('', '', punctuation)
+
+# Maps correctness bytes 0/1 to ASCII '0'/'1'
+_BIT_CHARS = bytes.maketrans(b'\x00\x01', b'01')
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LetterStatus:
-    """Status of a single letter in a word."""
+    """Status of a single letter in a word (immutable: shared via lru_cache).
+
+    Slotted: one is allocated per expected letter, so no per-instance __dict__.
+    """
     letter: str
     is_correct: bool
     error_type: Optional[str] = None  # 'substitution', 'deletion', None
@@ -26,15 +43,50 @@ class LetterStatus:
     actual: Optional[str] = None
 
 
+# LetterStatus constructors indexed by edit op code (OP_MATCH..OP_INSERT);
+# each takes (expected letter, spoken letter)
+_STATUS_BUILDERS = (
+    lambda letter, spoken: LetterStatus(
+        letter=letter, is_correct=True, expected=letter, actual=spoken
+    ),
+    lambda letter, spoken: LetterStatus(
+        letter=letter, is_correct=False, error_type='substitution',
+        expected=letter, actual=spoken
+    ),
+    lambda letter, spoken: LetterStatus(
+        letter=letter, is_correct=False, error_type='deletion',
+        expected=letter, actual=None
+    ),
+    None,
+)
+
+
+def _all_missing(expected_word: str) -> Tuple[LetterStatus, ...]:
+    """Every letter marked as a deletion (word or word ending missing)."""
+    return tuple(
+        LetterStatus(
+            letter=char,
+            is_correct=False,
+            error_type='deletion',
+            expected=char,
+            actual=None
+        )
+        for char in expected_word
+    )
+
+
 def highlight_letter_errors(
     expected_word: str,
     actual_word: str,
     case_sensitive: bool = False
-) -> List[LetterStatus]:
+) -> Tuple[LetterStatus, ...]:
     """
     Determine which letters in a word were pronounced correctly.
     
     Uses edit distance operations to align letters and identify errors.
+    Memoized on the normalized pair: the word and sentence helpers below,
+    and retries of the same prompt, all re-ask for the same words, so each
+    pair is aligned once.
     
     Args:
         expected_word: The expected word
@@ -42,97 +94,112 @@ def highlight_letter_errors(
         case_sensitive: Whether to treat case as errors
     
     Returns:
-        List of LetterStatus for each letter in expected word
+        Tuple of LetterStatus for each letter in expected word
     """
     if not expected_word:
-        return []
-    
-    if actual_word == '-' or not actual_word:
-        # Word was completely missing
-        return [
-            LetterStatus(
-                letter=char,
-                is_correct=False,
-                error_type='deletion',
-                expected=char,
-                actual=None
-            )
-            for char in expected_word
-        ]
+        return ()
     
-    # Normalize for comparison
+    # Normalize for comparison, so the cache is keyed on what is compared
     exp = expected_word if case_sensitive else expected_word.lower()
-    act = actual_word if case_sensitive else actual_word.lower()
+    act = actual_word if case_sensitive or not actual_word else actual_word.lower()
     
-    # Get edit operations
-    operations = get_edit_operations(exp, act)
+    return _highlight_cached(exp, act, expected_word)
+
+
+@lru_cache(maxsize=4096)
+def _highlight_cached(
+    exp: str,
+    act: str,
+    expected_word: str
+) -> Tuple[LetterStatus, ...]:
+    """Letter statuses for a normalized (exp, act) pair; see highlight_letter_errors."""
+    if act == '-' or not act:
+        # Word was completely missing
+        return _all_missing(expected_word)
+    
+    # Fast paths for equal lengths (the common case for good pronunciations):
+    # an exact match, or a single substituted letter, is already the optimal
+    # alignment, so the edit-distance DP can be skipped
+    if len(exp) == len(act):
+        mismatches = [i for i, (e, a) in enumerate(zip(exp, act)) if e != a]
+        if len(mismatches) <= 1:
+            return tuple(
+                LetterStatus(
+                    letter=char,
+                    is_correct=i not in mismatches,
+                    error_type='substitution' if i in mismatches else None,
+                    expected=char,
+                    actual=act[i]
+                )
+                for i, char in enumerate(expected_word)
+            )
     
-    # Build letter status from operations
-    result = []
+    # Build letter status from the edit operations; every expected letter
+    # gets exactly one slot, so fill a preallocated list by index
+    result = [None] * len(expected_word)
     exp_idx = 0
     
-    for op in operations:
-        if op['type'] == 'match':
-            result.append(LetterStatus(
-                letter=expected_word[exp_idx],
-                is_correct=True,
-                expected=expected_word[exp_idx],
-                actual=op['char2']
-            ))
-            exp_idx += 1
-        
-        elif op['type'] == 'substitute':
-            result.append(LetterStatus(
-                letter=expected_word[exp_idx],
-                is_correct=False,
-                error_type='substitution',
-                expected=expected_word[exp_idx],
-                actual=op['char2']
-            ))
-            exp_idx += 1
-        
-        elif op['type'] == 'delete':
-            result.append(LetterStatus(
-                letter=expected_word[exp_idx],
-                is_correct=False,
-                error_type='deletion',
-                expected=expected_word[exp_idx],
-                actual=None
-            ))
-            exp_idx += 1
-        
-        # 'insert' operations don't consume expected characters
+    for op_code, spoken in get_edit_op_codes(exp, act):
+        build = _STATUS_BUILDERS[op_code]
+        if build is None:
+            # Inserts don't consume expected characters
+            continue
+        result[exp_idx] = build(expected_word[exp_idx], spoken)
+        exp_idx += 1
     
     # Handle any remaining expected characters
-    while exp_idx < len(expected_word):
-        result.append(LetterStatus(
-            letter=expected_word[exp_idx],
-            is_correct=False,
-            error_type='deletion',
-            expected=expected_word[exp_idx],
-            actual=None
-        ))
-        exp_idx += 1
+    result[exp_idx:] = _all_missing(expected_word[exp_idx:])
     
-    return result
+    return tuple(result)
+
+
+def _correctness_bytes(statuses: Tuple[LetterStatus, ...]) -> bytes:
+    """Pack letter correctness into one byte per letter (bools are 0/1)."""
+    return bytes(s.is_correct for s in statuses)
+
+
+def _correctness_bitmap(expected_word: str, actual_word: str) -> bytes:
+    """
+    Letter correctness bytes straight from the edit operations.
+    
+    The 1/0 helpers only need to know which expected letters were matched,
+    so with rapidfuzz the bitmap is written from its editops (computed in C)
+    without building LetterStatus objects. Same result as
+    highlight_letter_errors; falls back to it without rapidfuzz.
+    """
+    if _RFLevenshtein is None or not expected_word:
+        return _correctness_bytes(highlight_letter_errors(expected_word, actual_word))
+    
+    exp, act = expected_word.lower(), (actual_word or '').lower()
+    if actual_word == '-' or not actual_word:
+        return bytes(len(expected_word))
+    
+    bits = bytearray(b'\x01') * len(expected_word)
+    for tag, src_pos, _ in _RFLevenshtein.editops(exp, act).as_list():
+        # Inserts don't consume an expected letter
+        if tag != 'insert':
+            bits[src_pos] = 0
+    return bytes(bits)
 
 
 def get_letter_correctness_array(
     expected_word: str,
     actual_word: str
-) -> List[int]:
+) -> 'array[int]':
     """
     Get simple array of 1s and 0s for letter correctness.
     
+    Returned as a packed array('b') (one byte per letter, copied from the
+    correctness bitmap in C); it indexes and iterates like a list.
+    
     Args:
         expected_word: Expected word
         actual_word: Actual word spoken
     
     Returns:
-        List[int]: 1 for correct, 0 for incorrect, for each letter
+        array('b'): 1 for correct, 0 for incorrect, for each letter
     """
-    statuses = highlight_letter_errors(expected_word, actual_word)
-    return [1 if s.is_correct else 0 for s in statuses]
+    return array('b', _correctness_bitmap(expected_word, actual_word))
 
 
 def format_letter_errors_string(
@@ -151,8 +218,7 @@ def format_letter_errors_string(
     Returns:
         str: e.g., "11101" for a 5-letter word with 1 error
     """
-    arr = get_letter_correctness_array(expected_word, actual_word)
-    return ''.join(str(x) for x in arr)
+    return _correctness_bitmap(expected_word, actual_word).translate(_BIT_CHARS).decode('ascii')
 
 
 def highlight_sentence_letters(
@@ -169,18 +235,17 @@ def highlight_sentence_letters(
     Returns:
         str: e.g., "111 1101 11111" for 3 words
     """
-    if len(actual_words) < len(expected_words):
-        actual_words = actual_words + ['-'] * (len(expected_words) - len(actual_words))
-    
-    word_results = []
-    for exp, act in zip(expected_words, actual_words):
+    # One buffer of 0/1 bytes with space separators, mapped to ASCII at the end
+    packed = bytearray()
+    # Missing trailing words read as '-'; extra spoken words are ignored
+    for exp, act in zip(expected_words, chain(actual_words, repeat('-'))):
         # Skip punctuation-only words
-        clean_exp = ''.join(c for c in exp if c not in punctuation)
-        if not clean_exp:
+        if not exp.translate(_PUNCT_TBL):
             continue
-        word_results.append(format_letter_errors_string(exp, act))
+        packed += _correctness_bitmap(exp, act)
+        packed.append(0x20)
     
-    return ' '.join(word_results)
+    return packed[:-1].translate(_BIT_CHARS).decode('ascii')
 
 
 def generate_highlighted_word(
@@ -205,22 +270,39 @@ def generate_highlighted_word(
     clean_expected = expected_word.rstrip(punctuation)
     clean_actual = actual_word.rstrip(punctuation) if actual_word and actual_word != '-' else actual_word
     
-    # Get letter statuses for the cleaned words (without punctuation)
-    statuses = highlight_letter_errors(clean_expected, clean_actual)
-    
-    letters = []
-    for status in statuses:
-        letters.append({
-            'letter': status.letter,
-            'is_correct': status.is_correct,
-            'class': correct_class if status.is_correct else incorrect_class,
-            'error_type': status.error_type,
-            'expected': status.expected,
-            'actual': status.actual
-        })
-    
-    correct_count = sum(1 for s in statuses if s.is_correct)
-    total = len(statuses)
+    # Correct letters carry only letter/is_correct/class; error details are
+    # emitted for incorrect letters only (smaller payload for good attempts)
+    if clean_expected and clean_actual and clean_expected.lower() == clean_actual.lower():
+        # Perfect word (most words in a good attempt): every letter is a
+        # match, so build the dicts directly without LetterStatus objects
+        letters = [
+            {'letter': char, 'is_correct': True, 'class': correct_class}
+            for char in clean_expected
+        ]
+        correct_count = len(letters)
+    else:
+        # Get letter statuses for the cleaned words (without punctuation)
+        letters = []
+        correct_count = 0
+        for status in highlight_letter_errors(clean_expected, clean_actual):
+            if status.is_correct:
+                correct_count += 1
+                letters.append({
+                    'letter': status.letter,
+                    'is_correct': True,
+                    'class': correct_class
+                })
+            else:
+                letters.append({
+                    'letter': status.letter,
+                    'is_correct': False,
+                    'class': incorrect_class,
+                    'error_type': status.error_type,
+                    'expected': status.expected,
+                    'actual': status.actual
+                })
+    
+    total = len(letters)
     
     return {
         'word': clean_expected,  # Return cleaned word (without punctuation)
@@ -247,18 +329,22 @@ def generate_highlighted_sentence(
     Returns:
         Dict with sentence info and per-word highlighting
     """
-    if len(actual_words) < len(expected_words):
-        actual_words = actual_words + ['-'] * (len(expected_words) - len(actual_words))
-    
     words = []
+    packed = bytearray()
     total_correct = 0
     total_letters = 0
     
-    for exp, act in zip(expected_words, actual_words):
+    # Missing trailing words read as '-'; extra spoken words are ignored
+    for exp, act in zip(expected_words, chain(actual_words, repeat('-'))):
         word_highlight = generate_highlighted_word(exp, act)
         words.append(word_highlight)
         total_correct += word_highlight['correct_count']
         total_letters += word_highlight['total_letters']
+        # Same pass builds the 1/0 string exactly as highlight_sentence_letters
+        # does: over the unstripped word, skipping punctuation-only words
+        if exp.translate(_PUNCT_TBL):
+            packed += _correctness_bitmap(exp, act)
+            packed.append(0x20)
     
     return {
         'words': words,
@@ -267,7 +353,67 @@ def generate_highlighted_sentence(
         'letter_accuracy': (total_correct / total_letters * 100) if total_letters > 0 else 0.0,
         'word_count': len(expected_words),
         'perfect_words': sum(1 for w in words if w['is_perfect']),
-        'letter_errors_string': highlight_sentence_letters(expected_words, actual_words)
+        'letter_errors_string': packed[:-1].translate(_BIT_CHARS).decode('ascii')
+    }
+
+
+def generate_perfect_sentence_highlighting(words: List[str]) -> Dict:
+    """
+    generate_highlighted_sentence(words, words) without any alignment work.
+    
+    For attempts spoken exactly as written: every word with letters is a
+    perfect match, so letter dicts and the all-'1' string are built directly.
+    
+    Args:
+        words: Expected words (equal to the actual words)
+    
+    Returns:
+        Same dict as generate_highlighted_sentence
+    """
+    highlighted = []
+    bit_groups = []
+    total_correct = 0
+    total_letters = 0
+    perfect_words = 0
+    
+    for word in words:
+        clean = word.rstrip(punctuation)
+        if clean:
+            total = len(clean)
+            highlighted.append({
+                'word': clean,
+                'actual': clean,
+                'letters': [
+                    {'letter': char, 'is_correct': True, 'class': 'correct'}
+                    for char in clean
+                ],
+                'correct_count': total,
+                'total_letters': total,
+                'accuracy': 100.0,
+                'is_perfect': True
+            })
+            total_correct += total
+            total_letters += total
+            perfect_words += 1
+            # The string covers the unstripped word, punctuation included
+            bit_groups.append('1' * len(word))
+        else:
+            # Punctuation-only token: keep the general path's exact output
+            word_highlight = generate_highlighted_word(word, word)
+            highlighted.append(word_highlight)
+            total_correct += word_highlight['correct_count']
+            total_letters += word_highlight['total_letters']
+            perfect_words += word_highlight['is_perfect']
+            # No letters, so nothing for the 1/0 string
+    
+    return {
+        'words': highlighted,
+        'total_correct_letters': total_correct,
+        'total_letters': total_letters,
+        'letter_accuracy': (total_correct / total_letters * 100) if total_letters > 0 else 0.0,
+        'word_count': len(words),
+        'perfect_words': perfect_words,
+        'letter_errors_string': ' '.join(bit_groups)
     }
 
 
@@ -286,6 +432,10 @@ def get_error_positions(expected_word: str, actual_word: str) -> List[int]:
     return [i for i, s in enumerate(statuses) if not s.is_correct]
 
 
+_DELETION_FMT = "Missing '{ch}' at position {pos}".format
+_SUBSTITUTION_FMT = "Position {pos}: said '{act}' instead of '{exp}'".format
+
+
 def describe_letter_errors(expected_word: str, actual_word: str) -> List[str]:
     """
     Generate human-readable descriptions of letter errors.
@@ -298,16 +448,13 @@ def describe_letter_errors(expected_word: str, actual_word: str) -> List[str]:
         List of error descriptions
     """
     statuses = highlight_letter_errors(expected_word, actual_word)
-    descriptions = []
-    
-    for i, status in enumerate(statuses):
-        if not status.is_correct:
-            pos = i + 1  # 1-indexed for user
-            if status.error_type == 'deletion':
-                descriptions.append(f"Missing '{status.letter}' at position {pos}")
-            elif status.error_type == 'substitution':
-                descriptions.append(
-                    f"Position {pos}: said '{status.actual}' instead of '{status.letter}'"
-                )
-    
-    return descriptions
+    # Filter first, so formatting only happens for the (few) wrong letters
+    errors = [(i + 1, s) for i, s in enumerate(statuses) if not s.is_correct]  # 1-indexed for user
+    
+    return [
+        _DELETION_FMT(ch=status.letter, pos=pos)
+        if status.error_type == 'deletion'
+        else _SUBSTITUTION_FMT(act=status.actual, exp=status.letter, pos=pos)
+        for pos, status in errors
+        if status.error_type in ('deletion', 'substitution')
+    ]
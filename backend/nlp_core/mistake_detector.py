@@ -10,17 +10,55 @@ Pinpoints exactly WHERE user made pronunciation errors:
 Uses LLM for generating dynamic, personalized pronunciation tips.
 """
 
+import copy
 import logging
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+import re
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass
+
+import numpy as np
 
 # Import letter highlighting for character-level feedback
-from .letter_highlighter import generate_highlighted_sentence, describe_letter_errors
+from .letter_highlighter import (
+    describe_letter_errors,
+    generate_highlighted_sentence,
+    generate_perfect_sentence_highlighting,
+)
+from .per_scorer import calculate_per_from_counts, classify_scores
+from .word_validator import normalize_sentence
 
 logger = logging.getLogger(__name__)
 
+# Finished mistake reports kept per detector (LRU)
+MISTAKE_REPORT_CACHE_SIZE = 1024
+
+# Max seconds an attempt waits on its batched AI tips before using fallbacks
+AI_TIP_TIMEOUT = 30
+
+# Formatted by BatchingLLMClient with {count} and the numbered {entries}
+AI_TIP_BATCH_PROMPT = """You are a speech therapy assistant. Generate concise pronunciation tips for this batch of {count} weak phonemes.
+
+Each entry is marked with its [index]:
+{entries}
+
+For each entry, provide ONE short, actionable tip (max 100 characters) that helps the user physically produce the sound correctly.
+
+Focus on:
+- Tongue position
+- Lip shape
+- Airflow
+- Common mistakes to avoid
+
+Return a JSON array of exactly {count} tips, in entry order ([1] first).
+Example: ["Put tongue between teeth for TH", "Round lips for SH sound"]
+
+Return ONLY the JSON array, no other text."""
+
 
-@dataclass
+@dataclass(slots=True)
 class Mistake:
     """Represents a single pronunciation mistake."""
     type: str  # 'missing_word', 'wrong_word', 'missing_sound', 'wrong_sound', 'weak_phoneme'
@@ -31,9 +69,166 @@ class Mistake:
     suggestion: str  # Help text for user
     phoneme: Optional[str] = None  # For phoneme-level errors
     word: Optional[str] = None  # Associated word
+    raw_score: Optional[float] = None  # Numeric phoneme score behind `actual`
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        # All fields are flat scalars: build directly instead of asdict()'s
+        # recursive deep copy
+        return {
+            'type': self.type,
+            'position': self.position,
+            'expected': self.expected,
+            'actual': self.actual,
+            'severity': self.severity,
+            'suggestion': self.suggestion,
+            'phoneme': self.phoneme,
+            'word': self.word,
+        }
+
+
+# Static articulation tips by base phoneme (no stress digit)
+_BASIC_TIPS = {
+    'TH': "Put your tongue between your teeth and blow air.",
+    'DH': "Put tongue between teeth, add voice for 'TH' in 'the'.",
+    'R': "Curl your tongue back slightly.",
+    'L': "Touch tongue tip to the roof of your mouth.",
+    'SH': "Round your lips and push air through.",
+    'CH': "Start with tongue at roof, release with 'SH'.",
+    'S': "Keep tongue behind teeth for a clear 'S'.",
+    'Z': "Add voice to the 'S' sound.",
+    'NG': "Sound comes from back of throat.",
+    'W': "Round your lips like saying 'oo'.",
+    'Y': "Touch tongue to roof, slide to the next sound.",
+    'V': "Touch upper teeth to lower lip, add voice.",
+    'F': "Touch upper teeth to lower lip, blow air.",
+}
+
+
+def _has_basic_tip(phoneme: Optional[str]) -> bool:
+    """Whether _BASIC_TIPS has a specific tip for this phoneme."""
+    return bool(phoneme) and phoneme.rstrip('0123456789') in _BASIC_TIPS
+
+
+@lru_cache(maxsize=256)
+def _fallback_tip(phoneme: str) -> str:
+    """Basic tip for a phoneme, used when AI tips are unavailable."""
+    # Strip stress markers
+    base = phoneme.rstrip('0123456789')
+    return _BASIC_TIPS.get(base, f"Practice the '{phoneme}' sound more carefully.")
+
+
+# Substitution severity by np.digitize(score, [0.3, 0.5]) bucket
+_SUBSTITUTION_SEVERITIES = ('major', 'moderate', 'minor')
+
+# Word-level suggestion text, str.format-ready (one place to reword/translate)
+_SUGGESTION_TEMPLATES = {
+    'missing_word': "You skipped the word '{word}'. Try saying the complete sentence.",
+    'missing_ending': "You said '{user}' but it should be '{word}'. Don't forget the '{sound}' at the end!",
+    'missing_beginning': "You said '{user}' but it should be '{word}'. Start with '{sound}'.",
+    'substituted_sound': "In '{word}', you used '{user_sound}' instead of '{expected_sound}'.",
+    'substituted_word': "'{user}' should be '{word}'.",
+    'th_substitution': "In '{word}', the 'TH' sound was pronounced as 'D' or 'T'. Put your tongue between your teeth.",
+    'wrong_word': "You said '{user}' instead of '{word}'. Practice this word.",
+    'extra_word': "You added an extra word '{user}'. Try to match the exact sentence.",
+}
+
+# Word-issue codes from asr_validator: 'missing_ending_<s>',
+# 'missing_beginning_<s>', 'substituted_<a>_with_<b>', 'th_substitution'
+_WORD_ISSUE_PATTERN = re.compile(r'(missing_ending|missing_beginning|substituted)_?(.*)')
+
+
+def _missing_ending_mistake(position, expected_word, user_said, missing) -> Mistake:
+    return Mistake(
+        type='missing_sound',
+        position=position,
+        expected=expected_word,
+        actual=user_said,
+        severity='moderate',
+        suggestion=_SUGGESTION_TEMPLATES['missing_ending'].format(
+            user=user_said, word=expected_word, sound=missing
+        ),
+        word=expected_word
+    )
+
+
+def _missing_beginning_mistake(position, expected_word, user_said, missing) -> Mistake:
+    return Mistake(
+        type='missing_sound',
+        position=position,
+        expected=expected_word,
+        actual=user_said,
+        severity='moderate',
+        suggestion=_SUGGESTION_TEMPLATES['missing_beginning'].format(
+            user=user_said, word=expected_word, sound=missing
+        ),
+        word=expected_word
+    )
+
+
+def _substituted_mistake(position, expected_word, user_said, detail) -> Mistake:
+    # e.g., detail "th_with_d" from "substituted_th_with_d"
+    parts = detail.split('_with_')
+    if len(parts) == 2:
+        expected_sound, user_sound = parts
+        return Mistake(
+            type='wrong_sound',
+            position=position,
+            expected=expected_word,
+            actual=user_said,
+            severity='minor',
+            suggestion=_SUGGESTION_TEMPLATES['substituted_sound'].format(
+                word=expected_word, user_sound=user_sound, expected_sound=expected_sound
+            ),
+            word=expected_word
+        )
+    return Mistake(
+        type='wrong_word',
+        position=position,
+        expected=expected_word,
+        actual=user_said,
+        severity='moderate',
+        suggestion=_SUGGESTION_TEMPLATES['substituted_word'].format(
+            user=user_said, word=expected_word
+        ),
+        word=expected_word
+    )
+
+
+def _th_substitution_mistake(position, expected_word, user_said, detail) -> Mistake:
+    return Mistake(
+        type='wrong_sound',
+        position=position,
+        expected=expected_word,
+        actual=user_said,
+        severity='moderate',
+        suggestion=_SUGGESTION_TEMPLATES['th_substitution'].format(word=expected_word),
+        word=expected_word,
+        phoneme='TH'
+    )
+
+
+def _wrong_word_mistake(position, expected_word, user_said, detail) -> Mistake:
+    return Mistake(
+        type='wrong_word',
+        position=position,
+        expected=expected_word,
+        actual=user_said,
+        severity='major',
+        suggestion=_SUGGESTION_TEMPLATES['wrong_word'].format(
+            user=user_said, word=expected_word
+        ),
+        word=expected_word
+    )
+
+
+# Issue kind -> Mistake builder(position, expected_word, user_said, detail);
+# anything else (e.g. 'mispronounced') is a wrong word
+_WORD_ISSUE_HANDLERS = {
+    'missing_ending': _missing_ending_mistake,
+    'missing_beginning': _missing_beginning_mistake,
+    'substituted': _substituted_mistake,
+    'th_substitution': _th_substitution_mistake,
+}
 
 
 class MistakeDetector:
@@ -46,14 +241,11 @@ class MistakeDetector:
     
     def __init__(self, weak_threshold: float = 0.7):
         self.weak_threshold = weak_threshold
-        self._llm_service = None
-    
-    def _get_llm_service(self):
-        """Lazy load LLM service."""
-        if self._llm_service is None:
-            from services.llm_service import LLMService
-            self._llm_service = LLMService()
-        return self._llm_service
+        # LRU of finished reports (retries of the same sentence repeat inputs)
+        self._report_cache = OrderedDict()
+        self._report_cache_lock = threading.Lock()
+        # Per-thread flag: did the report being built fall back on any AI tip
+        self._tip_state = threading.local()
     
     def detect_mistakes(
         self,
@@ -65,6 +257,83 @@ class MistakeDetector:
         """
         Combine word validation + phoneme scores to pinpoint all mistakes.
         
+        Reports are cached on (expected text, transcript, exact phoneme
+        scores), so a repeated attempt skips the LLM tip call. Reports whose
+        AI tips fell back after an LLM error or timeout are not cached.
+        
+        Args:
+            asr_result: Result from asr_validator.validate_speech()
+            phoneme_scores: List of phoneme score dicts from scorer
+            expected_text: The expected sentence text
+            word_validation: Optional result from word_validator
+        
+        Returns:
+            Comprehensive mistake report with PER scoring
+        """
+        key = self._report_cache_key(asr_result, phoneme_scores, expected_text)
+        
+        if key is not None:
+            with self._report_cache_lock:
+                cached = self._report_cache.get(key)
+                if cached is not None:
+                    self._report_cache.move_to_end(key)
+            if cached is not None:
+                # Callers may mutate the report; hand out a private copy
+                return copy.deepcopy(cached)
+        
+        self._tip_state.fell_back = False
+        report = self._build_mistake_report(
+            asr_result, phoneme_scores, expected_text, word_validation
+        )
+        
+        if key is not None and not self._tip_state.fell_back:
+            stored = copy.deepcopy(report)
+            with self._report_cache_lock:
+                self._report_cache[key] = stored
+                self._report_cache.move_to_end(key)
+                while len(self._report_cache) > MISTAKE_REPORT_CACHE_SIZE:
+                    self._report_cache.popitem(last=False)
+        
+        return report
+    
+    def _report_cache_key(
+        self,
+        asr_result: Dict,
+        phoneme_scores: List[Dict],
+        expected_text: str
+    ) -> Optional[tuple]:
+        """Cache key for a report, or None when the inputs aren't cacheable."""
+        if not isinstance(phoneme_scores, list):
+            return None
+        # Exact scores: rounding would let scores on either side of a
+        # classification/severity threshold share a key, and the raw value
+        # is rendered into the report text anyway
+        try:
+            scores = tuple(
+                (ps['phoneme'], ps.get('word'), float(ps.get('score', 0)), bool(ps.get('is_weak', False)))
+                for ps in phoneme_scores
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+        # weak_threshold is part of the key so a changed threshold never
+        # serves reports computed under the old one
+        return (
+            self.weak_threshold,
+            expected_text,
+            asr_result.get('transcribed', ''),
+            scores,
+        )
+    
+    def _build_mistake_report(
+        self,
+        asr_result: Dict,
+        phoneme_scores: List[Dict],
+        expected_text: str,
+        word_validation: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Combine word validation + phoneme scores to pinpoint all mistakes.
+        
         Implements mentor's guidance:
         1. Word-level validation first (missing/extra words)
         2. Phoneme-level comparison per word
@@ -80,8 +349,6 @@ class MistakeDetector:
         Returns:
             Comprehensive mistake report with PER scoring
         """
-        from .per_scorer import calculate_per, classify_phoneme_similarity, generate_per_feedback
-        
         mistakes = []
         
         # 1. Word-level mistakes from validation
@@ -92,24 +359,21 @@ class MistakeDetector:
         phoneme_mistakes, error_counts = self._detect_phoneme_mistakes_classified(phoneme_scores)
         mistakes.extend(phoneme_mistakes)
         
-        # 3. Calculate PER score
-        phonemes = [ps['phoneme'] for ps in phoneme_scores] if phoneme_scores else []
-        similarities = [ps['score'] for ps in phoneme_scores] if phoneme_scores else []
-        
-        per_result = calculate_per(phonemes, phonemes, similarities)
+        # 3. Calculate PER score from the classification counts (reference and
+        # user phonemes are the same aligned sequence, so no edit alignment)
+        scored = phoneme_scores and not isinstance(phoneme_scores, dict)
+        per_result = calculate_per_from_counts(
+            len(phoneme_scores) if scored else 0,
+            error_counts.get('substitution', 0),
+            error_counts.get('weak', 0)
+        )
         
         # 4. Generate letter-level highlighting
         letter_highlighting = self._generate_letter_highlighting(asr_result)
         
-        # 5. Generate user-friendly feedback
-        feedback = self._generate_feedback(mistakes, expected_text, phoneme_scores)
-        
-        # 6. Generate specific error messages
-        specific_errors = self._generate_specific_errors(
-            word_mistakes, 
-            phoneme_mistakes,
-            error_counts,
-            expected_text
+        # 5-6. User-friendly feedback, summary and specific error messages
+        feedback, summary, specific_errors = self._finalize(
+            mistakes, error_counts, expected_text
         )
         
         # 7. BLEND letter_accuracy into final adjusted_score
@@ -153,7 +417,7 @@ class MistakeDetector:
             
             'feedback': feedback,
             'letter_highlighting': letter_highlighting,
-            'summary': self._generate_summary(mistakes)
+            'summary': summary
         }
     
     def _detect_word_mistakes(self, asr_result: Dict) -> List[Mistake]:
@@ -168,7 +432,7 @@ class MistakeDetector:
                     expected=diff['word'],
                     actual='(not spoken)',
                     severity='major',
-                    suggestion=f"You skipped the word '{diff['word']}'. Try saying the complete sentence.",
+                    suggestion=_SUGGESTION_TEMPLATES['missing_word'].format(word=diff['word']),
                     word=diff['word']
                 ))
             
@@ -177,88 +441,22 @@ class MistakeDetector:
                 user_said = diff.get('user_said', '')
                 expected_word = diff['word']
                 
-                # Determine severity and generate specific suggestion
-                if 'missing_ending' in issue:
-                    missing = issue.replace('missing_ending_', '')
-                    mistakes.append(Mistake(
-                        type='missing_sound',
-                        position=diff['position'],
-                        expected=expected_word,
-                        actual=user_said,
-                        severity='moderate',
-                        suggestion=f"You said '{user_said}' but it should be '{expected_word}'. Don't forget the '{missing}' at the end!",
-                        word=expected_word
-                    ))
-                
-                elif 'missing_beginning' in issue:
-                    missing = issue.replace('missing_beginning_', '')
-                    mistakes.append(Mistake(
-                        type='missing_sound',
-                        position=diff['position'],
-                        expected=expected_word,
-                        actual=user_said,
-                        severity='moderate',
-                        suggestion=f"You said '{user_said}' but it should be '{expected_word}'. Start with '{missing}'.",
-                        word=expected_word
-                    ))
-                
-                elif 'substituted' in issue:
-                    # e.g., "substituted_th_with_d"
-                    parts = issue.replace('substituted_', '').split('_with_')
-                    if len(parts) == 2:
-                        expected_sound, user_sound = parts
-                        mistakes.append(Mistake(
-                            type='wrong_sound',
-                            position=diff['position'],
-                            expected=expected_word,
-                            actual=user_said,
-                            severity='minor',
-                            suggestion=f"In '{expected_word}', you used '{user_sound}' instead of '{expected_sound}'.",
-                            word=expected_word
-                        ))
-                    else:
-                        mistakes.append(Mistake(
-                            type='wrong_word',
-                            position=diff['position'],
-                            expected=expected_word,
-                            actual=user_said,
-                            severity='moderate',
-                            suggestion=f"'{user_said}' should be '{expected_word}'.",
-                            word=expected_word
-                        ))
-                
-                elif issue == 'th_substitution':
-                    mistakes.append(Mistake(
-                        type='wrong_sound',
-                        position=diff['position'],
-                        expected=expected_word,
-                        actual=user_said,
-                        severity='moderate',
-                        suggestion=f"In '{expected_word}', the 'TH' sound was pronounced as 'D' or 'T'. Put your tongue between your teeth.",
-                        word=expected_word,
-                        phoneme='TH'
-                    ))
-                
-                else:
-                    mistakes.append(Mistake(
-                        type='wrong_word',
-                        position=diff['position'],
-                        expected=expected_word,
-                        actual=user_said,
-                        severity='major',
-                        suggestion=f"You said '{user_said}' instead of '{expected_word}'. Practice this word.",
-                        word=expected_word
-                    ))
+                # Classify the issue with one prefix match, then dispatch
+                match = _WORD_ISSUE_PATTERN.match(issue)
+                kind, detail = (match.group(1), match.group(2)) if match else (issue, '')
+                handler = _WORD_ISSUE_HANDLERS.get(kind, _wrong_word_mistake)
+                mistakes.append(handler(diff['position'], expected_word, user_said, detail))
             
             elif diff['type'] == 'extra':
+                user_said = diff.get('user_said', '')
                 mistakes.append(Mistake(
                     type='extra_word',
                     position=diff['position'],
                     expected='(nothing)',
-                    actual=diff.get('user_said', ''),
+                    actual=user_said,
                     severity='minor',
-                    suggestion=f"You added an extra word '{diff.get('user_said', '')}'. Try to match the exact sentence.",
-                    word=diff.get('user_said', '')
+                    suggestion=_SUGGESTION_TEMPLATES['extra_word'].format(user=user_said),
+                    word=user_said
                 ))
         
         return mistakes
@@ -293,7 +491,8 @@ class MistakeDetector:
                     severity=severity,
                     suggestion='',  # Will be filled by AI
                     phoneme=phoneme,
-                    word=word
+                    word=word,
+                    raw_score=score
                 ))
         
         return mistakes
@@ -311,34 +510,35 @@ class MistakeDetector:
         - < 0.60: Incorrect (substitution)
         
         Returns:
-            Tuple of (mistakes list, error_counts dict)
+            Tuple of (mistakes list, error_counts Counter; absent kinds count 0)
         """
-        from .per_scorer import THRESHOLDS
-        
         mistakes = []
-        error_counts = {
-            'substitution': 0,
-            'deletion': 0,
-            'insertion': 0,
-            'weak': 0
-        }
         
         if not phoneme_scores or isinstance(phoneme_scores, dict):
-            return mistakes, error_counts
+            return mistakes, Counter()
         
-        for idx, ps in enumerate(phoneme_scores):
+        # Classify every phoneme at once: 0 = substitution, 1 = weak, 2 = correct
+        scores = np.fromiter(
+            (ps.get('score', 0) for ps in phoneme_scores),
+            dtype=np.float64,
+            count=len(phoneme_scores)
+        )
+        buckets = classify_scores(scores)
+        substitutions, weak, _ = np.bincount(buckets, minlength=3).tolist()
+        error_counts = Counter(substitution=substitutions, weak=weak)
+        
+        # Substitution severity by how wrong: 0 = major, 1 = moderate, 2 = minor
+        severities = np.digitize(scores, [0.3, 0.5])
+        
+        # Only the non-correct phonemes need Python-level work
+        for idx in np.flatnonzero(buckets < 2).tolist():
+            ps = phoneme_scores[idx]
             score = ps.get('score', 0)
             phoneme = ps['phoneme']
             word = ps.get('word', '')
             
-            # Classify based on thresholds
-            if score >= THRESHOLDS['correct']:
-                # CORRECT - no mistake
-                continue
-            
-            elif score >= THRESHOLDS['weak']:
+            if buckets[idx] == 1:
                 # WEAK - needs improvement but not wrong
-                error_counts['weak'] += 1
                 mistakes.append(Mistake(
                     type='weak_phoneme',
                     position=idx,
@@ -347,58 +547,116 @@ class MistakeDetector:
                     severity='minor',
                     suggestion=f"The '{phoneme}' sound in '{word}' needs to be clearer.",
                     phoneme=phoneme,
-                    word=word
+                    word=word,
+                    raw_score=score
                 ))
             
             else:
                 # SUBSTITUTION - wrong phoneme
-                error_counts['substitution'] += 1
-                
-                # Determine severity based on how wrong
-                if score < 0.3:
-                    severity = 'major'
-                elif score < 0.5:
-                    severity = 'moderate'
-                else:
-                    severity = 'minor'
-                
                 mistakes.append(Mistake(
                     type='substitution',
                     position=idx,
                     expected=phoneme,
                     actual=f"(wrong: {score:.0%})",
-                    severity=severity,
+                    severity=_SUBSTITUTION_SEVERITIES[severities[idx]],
                     suggestion=f"In '{word}': The '{phoneme}' sound was incorrect.",
                     phoneme=phoneme,
-                    word=word
+                    word=word,
+                    raw_score=score
                 ))
         
         return mistakes, error_counts
     
-    def _generate_specific_errors(
+    def _finalize(
         self,
-        word_mistakes: List[Mistake],
-        phoneme_mistakes: List[Mistake],
+        mistakes: List[Mistake],
         error_counts: Dict,
         expected_text: str
+    ) -> Tuple[Dict, str, List[str]]:
+        """
+        Build feedback, summary and specific errors from one pass over mistakes.
+        
+        Returns:
+            Tuple of (feedback dict, summary string, specific error messages)
+        """
+        if not mistakes:
+            return (
+                {
+                    'status': 'excellent',
+                    'message': 'Great job! You pronounced everything correctly!',
+                    'tips': []
+                },
+                "Perfect pronunciation!",
+                []
+            )
+        
+        buckets = {'major': [], 'moderate': [], 'minor': []}
+        weak_phonemes = []
+        missing_words = []
+        wrong_words = []
+        sub_mistake = None
+        weak_mistake = None
+        word_errors = 0
+        sound_errors = 0
+        
+        for m in mistakes:
+            t = m.type
+            bucket = buckets.get(m.severity)
+            if bucket is not None:
+                bucket.append(m)
+            
+            if t == 'weak_phoneme':
+                weak_phonemes.append(m)
+                if weak_mistake is None:
+                    weak_mistake = m
+            elif t == 'substitution':
+                if sub_mistake is None:
+                    sub_mistake = m
+            elif t == 'missing_word':
+                missing_words.append(m.word)
+            elif t in ('wrong_word', 'missing_sound'):
+                wrong_words.append(m)
+            
+            word_errors += 'word' in t
+            sound_errors += 'sound' in t or 'phoneme' in t
+        
+        feedback = self._generate_feedback(buckets, weak_phonemes, expected_text)
+        specific_errors = self._generate_specific_errors(
+            missing_words, wrong_words, sub_mistake, weak_mistake, error_counts
+        )
+        summary = self._generate_summary(word_errors, sound_errors)
+        
+        return feedback, summary, specific_errors
+    
+    def _generate_specific_errors(
+        self,
+        missing_words: List[str],
+        wrong_words: List[Mistake],
+        sub_mistake: Optional[Mistake],
+        weak_mistake: Optional[Mistake],
+        error_counts: Dict
     ) -> List[str]:
         """
         Generate specific, user-facing error messages.
         
         Format: "You missed 'X' phonemes" or "You said 'X' instead of 'Y'"
+        
+        Args:
+            missing_words: Words that were skipped
+            wrong_words: 'wrong_word'/'missing_sound' mistakes, in order
+            sub_mistake: First substitution mistake, if any
+            weak_mistake: First weak-phoneme mistake, if any
+            error_counts: Phoneme error counts by kind
         """
         errors = []
         
         # Word-level errors first (most important)
-        missing_words = [m for m in word_mistakes if m.type == 'missing_word']
         if missing_words:
-            words = [m.word for m in missing_words]
-            if len(words) == 1:
-                errors.append(f"You missed the word '{words[0]}'.")
+            if len(missing_words) == 1:
+                errors.append(f"You missed the word '{missing_words[0]}'.")
             else:
-                errors.append(f"You missed {len(words)} words: {', '.join(words)}.")
+                errors.append(f"You missed {len(missing_words)} words: {', '.join(missing_words)}.")
         
-        wrong_words = [m for m in word_mistakes if m.type in ['wrong_word', 'missing_sound']]
         for m in wrong_words[:3]:  # Limit to 3
             errors.append(m.suggestion)
         
@@ -406,8 +664,7 @@ class MistakeDetector:
         substitutions = error_counts.get('substitution', 0)
         if substitutions > 0:
             if substitutions == 1:
-                # Get the specific phoneme
-                sub_mistake = next((m for m in phoneme_mistakes if m.type == 'substitution'), None)
+                # Name the specific phoneme
                 if sub_mistake:
                     errors.append(f"You mispronounced the '{sub_mistake.phoneme}' sound in '{sub_mistake.word}'.")
             else:
@@ -416,7 +673,6 @@ class MistakeDetector:
         weak_count = error_counts.get('weak', 0)
         if weak_count > 0 and len(errors) < 5:
             if weak_count == 1:
-                weak_mistake = next((m for m in phoneme_mistakes if m.type == 'weak_phoneme'), None)
                 if weak_mistake:
                     errors.append(f"The '{weak_mistake.phoneme}' sound needs to be clearer.")
             else:
@@ -449,7 +705,7 @@ class MistakeDetector:
                 'errors_string': ''
             }
         
-        expected_words = expected.lower().split()
+        expected_words = list(normalize_sentence(expected).lower_words)
         
         # Try to use DTW comparison results if available
         dtw_comparison = asr_result.get('dtw_comparison', [])
@@ -466,7 +722,11 @@ class MistakeDetector:
         
         # Generate highlighting using the letter_highlighter module
         try:
-            highlighting = generate_highlighted_sentence(expected_words, actual_words)
+            if actual_words == expected_words:
+                # Spoken exactly as written: nothing to align
+                highlighting = generate_perfect_sentence_highlighting(expected_words)
+            else:
+                highlighting = generate_highlighted_sentence(expected_words, actual_words)
             
             # Add per-word error descriptions
             for i, word_data in enumerate(highlighting.get('words', [])):
@@ -491,25 +751,18 @@ class MistakeDetector:
             }
     
     def _generate_feedback(
-        self, 
-        mistakes: List[Mistake], 
-        expected_text: str,
-        phoneme_scores: List[Dict]
+        self,
+        buckets: Dict[str, List[Mistake]],
+        weak_phonemes: List[Mistake],
+        expected_text: str
     ) -> Dict:
         """
         Generate user-friendly feedback with AI-powered tips.
-        """
-        if not mistakes:
-            return {
-                'status': 'excellent',
-                'message': 'Great job! You pronounced everything correctly!',
-                'tips': []
-            }
         
-        # Group by severity
-        major = [m for m in mistakes if m.severity == 'major']
-        moderate = [m for m in mistakes if m.severity == 'moderate']
-        minor = [m for m in mistakes if m.severity == 'minor']
+        Takes the mistakes grouped by severity plus the weak phonemes (see
+        _finalize).
+        """
+        major, moderate, minor = buckets['major'], buckets['moderate'], buckets['minor']
         
         # Determine overall status
         if major:
@@ -525,10 +778,7 @@ class MistakeDetector:
         # Generate tips
         tips = []
         
-        # Get weak phonemes that need AI tips
-        weak_phonemes = [m for m in mistakes if m.type == 'weak_phoneme']
-        
-        # Generate AI tips for phonemes
+        # Generate AI tips for weak phonemes
         if weak_phonemes:
             ai_tips = self._generate_ai_tips(weak_phonemes, expected_text)
             # Update mistake suggestions with AI tips
@@ -563,94 +813,44 @@ class MistakeDetector:
         if not weak_phonemes:
             return []
         
+        # Fast feedback: the canned tips already cover these sounds, so skip
+        # the LLM round-trip entirely
+        if all(_has_basic_tip(m.phoneme) for m in weak_phonemes):
+            return [self._get_fallback_tip(m.phoneme) for m in weak_phonemes]
+        
         try:
-            llm = self._get_llm_service()
+            batcher = get_tip_batcher()
             
-            # Build prompt for AI
-            phoneme_list = []
+            # One batch entry per phoneme; concurrent attempts share LLM calls
+            futures = []
             for m in weak_phonemes:
-                phoneme_list.append({
-                    'phoneme': m.phoneme,
-                    'word': m.word or 'unknown',
-                    'score': float(m.actual.replace('(score: ', '').replace(')', '')) if 'score' in m.actual else 0.5
-                })
-            
-            prompt = f"""You are a speech therapy assistant. Generate concise pronunciation tips for these weak phonemes.
-
-Sentence: "{sentence}"
-
-Weak phonemes that need improvement:
-{phoneme_list}
-
-For each phoneme, provide ONE short, actionable tip (max 100 characters) that helps the user physically produce the sound correctly.
-
-Focus on:
-- Tongue position
-- Lip shape
-- Airflow
-- Common mistakes to avoid
-
-Return a JSON array of tips in the same order as the input phonemes.
-Example: ["Put tongue between teeth for TH", "Round lips for SH sound"]
-
-Return ONLY the JSON array, no other text."""
-
-            result = llm.generate(
-                prompt=prompt,
-                max_tokens=500,
-                temperature=0.3,
-                response_format="json"
-            )
+                score = m.raw_score if m.raw_score is not None else 0.5
+                futures.append(batcher.submit(
+                    f"phoneme '{m.phoneme}' in the word '{m.word or 'unknown'}' "
+                    f"(score {score:.2f}), sentence: \"{sentence}\""
+                ))
             
-            if result.get('success') and result.get('content'):
-                import json
-                content = result['content']
-                # Handle both string JSON and pre-parsed list
-                if isinstance(content, str):
-                    tips = json.loads(content)
+            tips = []
+            for m, future in zip(weak_phonemes, futures):
+                tip = future.result(timeout=AI_TIP_TIMEOUT)
+                if isinstance(tip, str) and tip:
+                    tips.append(tip)
                 else:
-                    tips = content  # Already parsed by LLM service
-                if isinstance(tips, list) and len(tips) == len(weak_phonemes):
-                    return tips
-            
-            # Fallback to basic tips
-            return [self._get_fallback_tip(m.phoneme) for m in weak_phonemes]
+                    self._tip_state.fell_back = True
+                    tips.append(self._get_fallback_tip(m.phoneme))
+            return tips
             
         except Exception as e:
             logger.warning(f"AI tip generation failed: {e}")
+            self._tip_state.fell_back = True
             return [self._get_fallback_tip(m.phoneme) for m in weak_phonemes]
     
     def _get_fallback_tip(self, phoneme: str) -> str:
         """Get basic fallback tip if AI fails."""
-        # Strip stress markers
-        base = ''.join(c for c in phoneme if not c.isdigit())
-        
-        basic_tips = {
-            'TH': "Put your tongue between your teeth and blow air.",
-            'DH': "Put tongue between teeth, add voice for 'TH' in 'the'.",
-            'R': "Curl your tongue back slightly.",
-            'L': "Touch tongue tip to the roof of your mouth.",
-            'SH': "Round your lips and push air through.",
-            'CH': "Start with tongue at roof, release with 'SH'.",
-            'S': "Keep tongue behind teeth for a clear 'S'.",
-            'Z': "Add voice to the 'S' sound.",
-            'NG': "Sound comes from back of throat.",
-            'W': "Round your lips like saying 'oo'.",
-            'Y': "Touch tongue to roof, slide to the next sound.",
-            'V': "Touch upper teeth to lower lip, add voice.",
-            'F': "Touch upper teeth to lower lip, blow air.",
-        }
-        
-        return basic_tips.get(base, f"Practice the '{phoneme}' sound more carefully.")
+        return _fallback_tip(phoneme)
     
-    def _generate_summary(self, mistakes: List[Mistake]) -> str:
-        """Generate one-line summary of all mistakes."""
-        if not mistakes:
-            return "Perfect pronunciation!"
-        
-        word_errors = len([m for m in mistakes if 'word' in m.type])
-        sound_errors = len([m for m in mistakes if 'sound' in m.type or 'phoneme' in m.type])
-        
+    def _generate_summary(self, word_errors: int, sound_errors: int) -> str:
+        """Generate one-line summary from word- and sound-level mistake counts."""
         parts = []
         if word_errors:
             parts.append(f"{word_errors} word(s)")
@@ -660,6 +860,28 @@ Return ONLY the JSON array, no other text."""
         return f"Work on: {', '.join(parts)}" if parts else "Minor improvements needed"
 
 
+# Batched AI tip generation, shared by all requests in the process
+_tip_batcher = None
+_tip_batcher_lock = threading.Lock()
+
+
+def get_tip_batcher():
+    """Get or create the process-wide batching client for phoneme tips."""
+    global _tip_batcher
+    if _tip_batcher is None:
+        with _tip_batcher_lock:
+            if _tip_batcher is None:
+                from services.llm_service import get_llm_service
+                from services.llm_batcher import BatchingLLMClient
+                _tip_batcher = BatchingLLMClient(
+                    get_llm_service(),
+                    AI_TIP_BATCH_PROMPT,
+                    max_tokens_per_entry=100,
+                    temperature=0.3,
+                )
+    return _tip_batcher
+
+
 # Singleton
 _mistake_detector = None
 
@@ -672,6 +894,12 @@ def get_mistake_detector() -> MistakeDetector:
     return _mistake_detector
 
 
-def detect_mistakes(asr_result: Dict, phoneme_scores: List[Dict], expected_text: str) -> Dict:
+def detect_mistakes(
+    asr_result: Dict,
+    phoneme_scores: List[Dict],
+    expected_text: str
+) -> Dict:
     """Convenience function for detecting mistakes."""
-    return get_mistake_detector().detect_mistakes(asr_result, phoneme_scores, expected_text)
+    return get_mistake_detector().detect_mistakes(
+        asr_result, phoneme_scores, expected_text
+    )
@@ -8,9 +8,11 @@ Implements mentor's scoring strategy:
 """
 
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,8 +31,12 @@ THRESHOLDS = {
     # < 0.60 = incorrect (substitution)
 }
 
+# Scored-phoneme count from which NumPy masks beat a Python comprehension
+# (array conversion has a fixed cost that short sentences never win back)
+PER_NUMPY_MIN_PHONEMES = 256
+
 
-@dataclass
+@dataclass(slots=True)
 class PhonemeError:
     """Represents a single phoneme-level error."""
     word: str
@@ -42,7 +48,7 @@ class PhonemeError:
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PERResult:
     """Result of PER scoring."""
     per_score: float           # 0.0 to 1.0 (0 = perfect, 1 = all errors)
@@ -96,39 +102,26 @@ def calculate_per(
             summary="No phonemes to evaluate."
         )
     
-    # Counts
-    correct = 0
-    substitutions = 0
-    deletions = 0
+    # Reference phonemes past the end of similarity_scores were not
+    # produced at all (deletions)
+    scored = min(total_ref, len(similarity_scores))
+    flagged = _flag_similarities(similarity_scores[:scored])
+    
+    weak = sum(is_weak for _, is_weak in flagged)
+    substitutions = len(flagged) - weak
+    correct = scored - len(flagged)
+    deletions = total_ref - scored
     insertions = 0
-    weak = 0
     errors = []
     
-    # Process each reference phoneme
-    for i, ref_phoneme in enumerate(reference_phonemes):
-        if i >= len(similarity_scores):
-            # User didn't produce this phoneme - DELETION
-            deletions += 1
-            errors.append(PhonemeError(
-                word="",
-                position=i,
-                expected_phoneme=ref_phoneme,
-                actual_phoneme=None,
-                error_type='deletion',
-                similarity=0.0,
-                message=f"Missing phoneme /{ref_phoneme}/ at position {i+1}."
-            ))
-            continue
-        
+    # PhonemeError objects only for the (usually few) flagged phonemes
+    for i, is_weak in flagged:
+        ref_phoneme = reference_phonemes[i]
         sim = similarity_scores[i]
         user_phoneme = user_phonemes[i] if i < total_user else None
         
-        if sim >= THRESHOLDS['correct']:
-            # CORRECT
-            correct += 1
-        elif sim >= THRESHOLDS['weak']:
+        if is_weak:
             # WEAK (needs improvement but not wrong)
-            weak += 1
             errors.append(PhonemeError(
                 word="",
                 position=i,
@@ -140,7 +133,6 @@ def calculate_per(
             ))
         else:
             # SUBSTITUTION (wrong phoneme)
-            substitutions += 1
             errors.append(PhonemeError(
                 word="",
                 position=i,
@@ -151,6 +143,19 @@ def calculate_per(
                 message=f"You said /{user_phoneme}/ instead of /{ref_phoneme}/."
             ))
     
+    # User didn't produce these phonemes - DELETION
+    for i in range(scored, total_ref):
+        ref_phoneme = reference_phonemes[i]
+        errors.append(PhonemeError(
+            word="",
+            position=i,
+            expected_phoneme=ref_phoneme,
+            actual_phoneme=None,
+            error_type='deletion',
+            similarity=0.0,
+            message=f"Missing phoneme /{ref_phoneme}/ at position {i+1}."
+        ))
+    
     # Check for insertions (extra phonemes at end)
     if total_user > total_ref:
         insertions = total_user - total_ref
@@ -165,6 +170,90 @@ def calculate_per(
                 message=f"Extra phoneme /{user_phonemes[i]}/ at position {i+1}."
             ))
     
+    return _build_per_result(
+        total_ref, correct, substitutions, deletions, insertions, weak, errors
+    )
+
+
+def classify_scores(similarities) -> np.ndarray:
+    """
+    Quantize similarity scores against THRESHOLDS in one vectorized pass.
+    
+    Args:
+        similarities: Similarity per phoneme (list or array of floats)
+    
+    Returns:
+        np.ndarray: uint8 label per phoneme - 0 = substitution, 1 = weak,
+        2 = correct. NaN scores are labelled substitutions, so
+        np.bincount(labels, minlength=3) gives all three counts.
+    """
+    sims = np.asarray(similarities, dtype=np.float64)
+    labels = np.digitize(sims, [THRESHOLDS['weak'], THRESHOLDS['correct']]).astype(np.uint8)
+    # digitize sorts NaN past the last bin
+    labels[np.isnan(sims)] = 0
+    return labels
+
+
+def _flag_similarities(similarities: List[float]) -> List[Tuple[int, bool]]:
+    """
+    (index, is_weak) for every phoneme below THRESHOLDS['correct'].
+    
+    is_weak is False for substitutions (below THRESHOLDS['weak']); NaN
+    scores count as substitutions.
+    """
+    correct_threshold = THRESHOLDS['correct']
+    weak_threshold = THRESHOLDS['weak']
+    
+    if len(similarities) < PER_NUMPY_MIN_PHONEMES:
+        return [
+            (i, sim >= weak_threshold)
+            for i, sim in enumerate(similarities)
+            if not sim >= correct_threshold
+        ]
+    
+    # Long passages: one vectorized pass, Python only for flagged indices
+    labels = classify_scores(similarities)
+    flagged = np.flatnonzero(labels < 2)
+    return list(zip(flagged.tolist(), (labels[flagged] == 1).tolist()))
+
+
+def calculate_per_from_counts(
+    total_phonemes: int,
+    substitutions: int,
+    weak: int
+) -> PERResult:
+    """
+    PER result from phonemes already classified against THRESHOLDS.
+    
+    Same scores and summary as calculate_per(phonemes, phonemes, scores) -
+    comparing a sequence with itself has no deletions or insertions - but
+    skips building the per-phoneme `errors` list.
+    
+    Args:
+        total_phonemes: Number of reference phonemes
+        substitutions: Phonemes scoring below THRESHOLDS['weak']
+        weak: Phonemes scoring in [THRESHOLDS['weak'], THRESHOLDS['correct'])
+    
+    Returns:
+        PERResult with an empty errors list
+    """
+    if total_phonemes == 0:
+        return calculate_per([], [], [])
+    
+    correct = total_phonemes - substitutions - weak
+    return _build_per_result(total_phonemes, correct, substitutions, 0, 0, weak, [])
+
+
+def _build_per_result(
+    total_ref: int,
+    correct: int,
+    substitutions: int,
+    deletions: int,
+    insertions: int,
+    weak: int,
+    errors: List[PhonemeError]
+) -> PERResult:
+    """Compute PER, penalty-adjusted score and summary from error counts."""
     # Calculate PER
     per = (substitutions + deletions + insertions) / total_ref
     
@@ -270,10 +359,15 @@ def generate_per_feedback(per_result: PERResult, sentence_text: str) -> List[str
     """
     feedback = []
     
-    # Prioritize by error type
-    deletions = [e for e in per_result.errors if e.error_type == 'deletion']
-    substitutions = [e for e in per_result.errors if e.error_type == 'substitution']
-    weak = [e for e in per_result.errors if e.error_type == 'weak']
+    # Prioritize by error type (bucketed in one pass; insertions not reported)
+    deletions = []
+    substitutions = []
+    weak = []
+    buckets = {'deletion': deletions, 'substitution': substitutions, 'weak': weak}
+    for error in per_result.errors:
+        bucket = buckets.get(error.error_type)
+        if bucket is not None:
+            bucket.append(error)
     
     # Report deletions first (most important)
     for error in deletions[:3]:  # Limit to 3
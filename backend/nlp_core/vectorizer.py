@@ -12,11 +12,14 @@ The fix is to process the FULL audio and then slice the embedding TENSOR.
 """
 
 import logging
+import math
+import threading
 from typing import List, Dict, Tuple, Optional
 import pickle
 import numpy as np
+import soundfile as sf
 import torch
-import torchaudio
+from scipy.signal import resample_poly
 from transformers import Wav2Vec2Model, Wav2Vec2Processor
 from django.conf import settings
 
@@ -25,21 +28,33 @@ logger = logging.getLogger(__name__)
 # Singleton model for embedding generation
 _embedding_processor = None
 _embedding_model = None
+_embedding_model_lock = threading.Lock()
 
 # Wav2Vec2 stride: ~320 samples at 16kHz = 0.02 seconds per frame
 WAV2VEC2_STRIDE_SECONDS = 320 / 16000  # 0.02
 
 
 def get_embedding_model():
-    """Get or load the Wav2Vec2 model for embeddings."""
+    """Get or load the Wav2Vec2 model for embeddings.
+    
+    Locked so the startup pre-warm thread and an early request can't both
+    load the weights; low_cpu_mem_usage loads them straight into the model
+    instead of random-initializing first and copying over.
+    """
     global _embedding_processor, _embedding_model
     
     if _embedding_processor is None or _embedding_model is None:
-        logger.info("Loading Wav2Vec2 embedding model...")
-        _embedding_processor = Wav2Vec2Processor.from_pretrained("facebook/wav2vec2-base-960h")
-        _embedding_model = Wav2Vec2Model.from_pretrained("facebook/wav2vec2-base-960h")
-        _embedding_model.eval()
-        logger.info("Wav2Vec2 embedding model loaded")
+        with _embedding_model_lock:
+            if _embedding_processor is None or _embedding_model is None:
+                logger.info("Loading Wav2Vec2 embedding model...")
+                processor = Wav2Vec2Processor.from_pretrained("facebook/wav2vec2-base-960h")
+                model = Wav2Vec2Model.from_pretrained(
+                    "facebook/wav2vec2-base-960h",
+                    low_cpu_mem_usage=True,
+                )
+                model.eval()
+                _embedding_processor, _embedding_model = processor, model
+                logger.info("Wav2Vec2 embedding model loaded")
     
     return _embedding_processor, _embedding_model
 
@@ -66,22 +81,23 @@ def compute_contextual_embeddings(audio_path: str) -> Tuple[np.ndarray, float]:
     processor, model = get_embedding_model()
     
     try:
-        # Load full audio
-        waveform, sr = torchaudio.load(audio_path)
+        # Load full audio straight into float32 numpy (libsndfile); the
+        # processor consumes numpy, so a torch tensor round-trip buys nothing
+        waveform, sr = sf.read(audio_path, dtype='float32', always_2d=False)
         
-        # Resample to 16kHz if needed
+        # Convert to mono first so the resample below filters one channel
+        if waveform.ndim > 1:
+            waveform = waveform.mean(axis=1)
+        
+        # Resample to 16kHz if needed (polyphase; cleaned audio is already 16kHz)
         if sr != 16000:
-            resampler = torchaudio.transforms.Resample(sr, 16000)
-            waveform = resampler(waveform)
+            g = math.gcd(int(sr), 16000)
+            waveform = resample_poly(waveform, 16000 // g, int(sr) // g).astype(np.float32)
             sr = 16000
         
-        # Convert to mono
-        if waveform.shape[0] > 1:
-            waveform = torch.mean(waveform, dim=0, keepdim=True)
-        
         # Get full embeddings - model processes ENTIRE audio with full context
         inputs = processor(
-            waveform.squeeze().numpy(),
+            waveform,
             sampling_rate=sr,
             return_tensors="pt",
             padding=True
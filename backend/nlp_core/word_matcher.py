@@ -7,10 +7,13 @@ Ported from ai-pronunciation-trainer project with enhancements.
 
 import logging
 import numpy as np
-from typing import List, Tuple, Optional
+from collections import Counter
+from typing import List, Tuple, Optional, Union
 from string import punctuation
 
-from .edit_distance import edit_distance
+from .dtw import dtw_warping_path
+from .edit_distance import edit_distance_matrix, edit_distance_pairs
+from .word_validator import NormalizedSentence
 
 logger = logging.getLogger(__name__)
 
@@ -34,19 +37,15 @@ def get_word_distance_matrix(words_estimated: List[str], words_real: List[str])
     num_real = len(words_real)
     
     # Matrix with extra row for "no match" option
-    matrix = np.zeros((num_estimated + OFFSET_BLANK, num_real))
+    matrix = np.empty((num_estimated + OFFSET_BLANK, num_real))
     
     # Fill with edit distances
-    for i, est_word in enumerate(words_estimated):
-        for j, real_word in enumerate(words_real):
-            matrix[i, j] = edit_distance(
-                est_word.lower().strip(),
-                real_word.lower().strip()
-            )
+    estimated = [w.lower().strip() for w in words_estimated]
+    real = [w.lower().strip() for w in words_real]
+    matrix[:num_estimated] = edit_distance_matrix(estimated, real)
     
     # Last row: cost of not matching (length of real word)
-    for j, real_word in enumerate(words_real):
-        matrix[num_estimated, j] = len(real_word)
+    matrix[num_estimated] = [len(real_word) for real_word in words_real]
     
     return matrix
 
@@ -60,58 +59,77 @@ def align_words_dtw(words_estimated: List[str], words_real: List[str]) -> np.nda
         words_real: Expected words from reference text
     
     Returns:
-        np.ndarray: Mapping indices (estimated index for each real word)
+        np.ndarray: int64 mapping indices (estimated index for each real word)
     """
-    try:
-        from dtwalign import dtw_from_distance_matrix
-    except ImportError:
-        logger.warning("dtwalign not installed, using fallback alignment")
-        return _fallback_alignment(words_estimated, words_real)
+    use_kernel = _use_dtw_kernel()
+    if not use_kernel:
+        try:
+            from dtwalign import dtw_from_distance_matrix
+        except ImportError:
+            logger.warning("dtwalign not installed, using fallback alignment")
+            return _fallback_alignment(words_estimated, words_real)
     
     if not words_estimated or not words_real:
-        return np.array([])
+        return np.array([], dtype=np.int64)
     
     # Build distance matrix
     distance_matrix = get_word_distance_matrix(words_estimated, words_real)
     
     try:
+        if use_kernel:
+            # Compiled kernel, same warping path as dtwalign below
+            path = dtw_warping_path(np.ascontiguousarray(distance_matrix.T))
+            return path[:len(words_estimated)]
+        
         # DTW alignment (transpose for dtwalign format)
         alignment = dtw_from_distance_matrix(distance_matrix.T)
         mapped_indices = alignment.get_warping_path()[:len(words_estimated)]
-        return mapped_indices
+        return np.asarray(mapped_indices, dtype=np.int64)
     except Exception as e:
         logger.warning(f"DTW alignment failed: {e}, using fallback")
         return _fallback_alignment(words_estimated, words_real)
 
 
+def _use_dtw_kernel() -> bool:
+    """Whether the opt-in Numba DTW kernel is enabled and available."""
+    if dtw_warping_path is None:
+        return False
+    from django.conf import settings
+    return bool(settings.SCORING_CONFIG.get('NUMBA_DTW', False))
+
+
 def _fallback_alignment(words_estimated: List[str], words_real: List[str]) -> np.ndarray:
     """Greedy alignment fallback when DTW fails."""
     num_real = len(words_real)
     num_estimated = len(words_estimated)
     
-    # Simple greedy: assign each real word to best matching estimated word
+    # Simple greedy: assign each real word to best matching estimated word.
+    # All distances come from one matrix; used estimated words become inf.
+    # Matches need distance < len(real_word), so anything past the longest
+    # real word can be cut off early (capped values are rejected anyway).
     mapped_indices = []
-    used_estimated = set()
+    max_accepted = max((len(w) for w in words_real), default=1) - 1
+    distances = edit_distance_matrix(
+        [w.lower() for w in words_estimated],
+        [w.lower() for w in words_real],
+        score_cutoff=max(max_accepted, 0)
+    ).astype(np.float64)
     
     for j, real_word in enumerate(words_real):
-        best_idx = -1
-        best_dist = float('inf')
-        
-        for i, est_word in enumerate(words_estimated):
-            if i in used_estimated:
-                continue
-            dist = edit_distance(est_word.lower(), real_word.lower())
-            if dist < best_dist:
-                best_dist = dist
-                best_idx = i
+        if num_estimated:
+            column = distances[:, j]
+            best_idx = int(column.argmin())
+            best_dist = column[best_idx]
+        else:
+            best_dist = np.inf
         
-        if best_idx >= 0 and best_dist < len(real_word):
+        if best_dist < len(real_word):
             mapped_indices.append(best_idx)
-            used_estimated.add(best_idx)
+            distances[best_idx] = np.inf
         else:
             mapped_indices.append(-1)  # No match
     
-    return np.array(mapped_indices)
+    return np.array(mapped_indices, dtype=np.int64)
 
 
 def get_mapped_words(
@@ -143,10 +161,19 @@ def get_mapped_words(
     mapped_words = []
     mapped_word_indices = []
     WORD_NOT_FOUND = '-'
+    estimated_lower = None  # lowercased on the first multi-match
+    num_real = len(words_real)
+    num_estimated = len(words_estimated)
     
-    for word_idx in range(len(words_real)):
-        # Find which estimated words map to this real word
-        positions = np.where(mapped_indices == word_idx)[0].astype(int)
+    # Group estimated positions by the real word they map to, in one pass
+    buckets = [[] for _ in range(num_real)]
+    for est_idx, real_idx in enumerate(mapped_indices.tolist()):
+        if 0 <= real_idx < num_real:
+            buckets[real_idx].append(est_idx)
+    
+    for word_idx in range(num_real):
+        # Which estimated words map to this real word
+        positions = buckets[word_idx]
         
         if len(positions) == 0:
             mapped_words.append(WORD_NOT_FOUND)
@@ -155,40 +182,41 @@ def get_mapped_words(
         
         if len(positions) == 1:
             idx = positions[0]
-            if idx < len(words_estimated):
+            if idx < num_estimated:
                 mapped_words.append(words_estimated[idx])
-                mapped_word_indices.append(int(idx))
+                mapped_word_indices.append(idx)
             else:
                 mapped_words.append(WORD_NOT_FOUND)
                 mapped_word_indices.append(-1)
             continue
         
-        # Multiple matches - pick best one
-        best_word = WORD_NOT_FOUND
-        best_idx = -1
-        best_dist = float('inf')
+        # Multiple matches - pick the closest (first on ties), with all
+        # candidate distances from one batch call
+        candidates = [idx for idx in positions if idx < num_estimated]
+        if not candidates:
+            mapped_words.append(WORD_NOT_FOUND)
+            mapped_word_indices.append(-1)
+            continue
+        
+        if estimated_lower is None:
+            estimated_lower = [w.lower() for w in words_estimated]
+        real_lower = words_real[word_idx].lower()
         
-        for idx in positions:
-            if idx >= len(words_estimated):
-                continue
-            dist = edit_distance(
-                words_estimated[idx].lower(),
-                words_real[word_idx].lower()
-            )
-            if dist < best_dist:
-                best_dist = dist
-                best_word = words_estimated[idx]
-                best_idx = int(idx)
+        distances = edit_distance_pairs(
+            [estimated_lower[idx] for idx in candidates],
+            [real_lower] * len(candidates)
+        )
+        best_idx = candidates[int(distances.argmin())]
         
-        mapped_words.append(best_word)
+        mapped_words.append(words_estimated[best_idx])
         mapped_word_indices.append(best_idx)
     
     return mapped_words, mapped_word_indices
 
 
 def compare_word_sequences(
-    expected_words: List[str],
-    actual_words: List[str]
+    expected_words: Union[List[str], NormalizedSentence],
+    actual_words: Union[List[str], NormalizedSentence]
 ) -> List[dict]:
     """
     Compare expected vs actual word sequences with DTW alignment.
@@ -196,59 +224,91 @@ def compare_word_sequences(
     Returns detailed comparison for each expected word.
     
     Args:
-        expected_words: List of expected words
-        actual_words: List of ASR transcribed words
+        expected_words: List of expected words (or a NormalizedSentence)
+        actual_words: List of ASR transcribed words (or a NormalizedSentence)
     
     Returns:
         List of comparison dicts with match status and details
     """
+    if isinstance(expected_words, NormalizedSentence):
+        expected_words = list(expected_words.original_words)
+    if isinstance(actual_words, NormalizedSentence):
+        actual_words = list(actual_words.original_words)
+    
     mapped_words, mapped_indices = get_mapped_words(actual_words, expected_words)
     
-    results = []
-    for i, expected in enumerate(expected_words):
-        actual = mapped_words[i] if i < len(mapped_words) else '-'
-        idx = mapped_indices[i] if i < len(mapped_indices) else -1
-        
+    num_expected = len(expected_words)
+    actuals = [
+        mapped_words[i] if i < len(mapped_words) else '-'
+        for i in range(num_expected)
+    ]
+    statuses = [None] * num_expected
+    similarities = [0.0] * num_expected
+    
+    # Missing and exact words are settled here; the rest are collected so
+    # their edit distances come from one batch call
+    pending = []
+    pending_expected = []
+    pending_actual = []
+    for i, (expected, actual) in enumerate(zip(expected_words, actuals)):
         if actual == '-':
-            status = 'missing'
-            similarity = 0.0
-        elif expected.lower().strip() == actual.lower().strip():
-            status = 'correct'
-            similarity = 1.0
-        else:
-            distance = edit_distance(expected.lower(), actual.lower())
-            max_len = max(len(expected), len(actual))
-            similarity = 1.0 - (distance / max_len) if max_len > 0 else 0.0
-            status = 'partial' if similarity > 0.5 else 'wrong'
+            statuses[i] = 'missing'
+            continue
         
+        expected_lower = expected.lower()
+        actual_lower = actual.lower()
+        if expected_lower.strip() == actual_lower.strip():
+            statuses[i] = 'correct'
+            similarities[i] = 1.0
+        else:
+            pending.append(i)
+            pending_expected.append(expected_lower)
+            pending_actual.append(actual_lower)
+    
+    if pending:
+        distances = edit_distance_pairs(pending_expected, pending_actual)
+        max_lens = np.fromiter(
+            (max(len(expected_words[i]), len(actuals[i])) for i in pending),
+            dtype=np.float64,
+            count=len(pending)
+        )
+        for i, similarity in zip(pending, (1.0 - distances / max_lens).tolist()):
+            similarities[i] = similarity
+            statuses[i] = 'partial' if similarity > 0.5 else 'wrong'
+    
+    results = []
+    for i, expected in enumerate(expected_words):
+        status = statuses[i]
         results.append({
             'position': i,
             'expected': expected,
-            'actual': actual,
-            'actual_index': idx,
+            'actual': actuals[i],
+            'actual_index': mapped_indices[i] if i < len(mapped_indices) else -1,
             'status': status,
-            'similarity': round(similarity, 3),
+            'similarity': round(similarities[i], 3),
             'is_match': status == 'correct',
             'is_missing': status == 'missing',
             'is_wrong': status in ['wrong', 'partial']
         })
     
     # Check for extra words (insertions)
-    used_indices = set(idx for idx in mapped_indices if idx >= 0)
-    for i, word in enumerate(actual_words):
-        if i not in used_indices:
-            results.append({
-                'position': -1,
-                'expected': '',
-                'actual': word,
-                'actual_index': i,
-                'status': 'extra',
-                'similarity': 0.0,
-                'is_match': False,
-                'is_missing': False,
-                'is_wrong': True,
-                'is_extra': True
-            })
+    num_actual = len(actual_words)
+    used = np.zeros(num_actual, dtype=bool)
+    indices = np.asarray(mapped_indices, dtype=np.int64)
+    used[indices[(indices >= 0) & (indices < num_actual)]] = True
+    for i in np.flatnonzero(~used).tolist():
+        results.append({
+            'position': -1,
+            'expected': '',
+            'actual': actual_words[i],
+            'actual_index': i,
+            'status': 'extra',
+            'similarity': 0.0,
+            'is_match': False,
+            'is_missing': False,
+            'is_wrong': True,
+            'is_extra': True
+        })
     
     return results
 
@@ -263,12 +323,14 @@ def get_word_match_summary(comparison_results: List[dict]) -> dict:
     Returns:
         Summary dict with counts and accuracy
     """
-    total = len([r for r in comparison_results if r.get('status') != 'extra'])
-    correct = sum(1 for r in comparison_results if r.get('status') == 'correct')
-    partial = sum(1 for r in comparison_results if r.get('status') == 'partial')
-    wrong = sum(1 for r in comparison_results if r.get('status') == 'wrong')
-    missing = sum(1 for r in comparison_results if r.get('status') == 'missing')
-    extra = sum(1 for r in comparison_results if r.get('status') == 'extra')
+    # One pass over the results for every status count
+    statuses = Counter(r.get('status') for r in comparison_results)
+    correct = statuses['correct']
+    partial = statuses['partial']
+    wrong = statuses['wrong']
+    missing = statuses['missing']
+    extra = statuses['extra']
+    total = len(comparison_results) - extra
     
     accuracy = (correct / total * 100) if total > 0 else 0.0
     
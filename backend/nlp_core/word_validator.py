@@ -11,11 +11,49 @@ Key Logic:
 """
 
 import logging
-from typing import List, Tuple, Dict, Optional
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import List, Tuple, Dict, NamedTuple, Optional, Union
 from dataclasses import dataclass
 
+import numpy as np
+
+from .edit_distance import edit_distance_matrix, edit_distance_within
+
 logger = logging.getLogger(__name__)
 
+# Non-phoneme symbols g2p_en emits between and inside words
+_BAD_PHONEMES = frozenset({' ', "'", '-', ''})
+
+
+class NormalizedSentence(NamedTuple):
+    """A sentence split into words once, as written and lowercased."""
+    original_words: Tuple[str, ...]
+    lower_words: Tuple[str, ...]
+
+
+@lru_cache(maxsize=256)
+def normalize_sentence(sentence_text: str) -> NormalizedSentence:
+    """
+    Split and lowercase a sentence once for all word-level checks.
+    
+    Cached: lessons repeat the same reference sentences, and the result is
+    an immutable (hashable) tuple safe to share between requests.
+    """
+    original_words = tuple(sentence_text.split())
+    return NormalizedSentence(
+        original_words=original_words,
+        lower_words=tuple(w.lower() for w in original_words)
+    )
+
+
+def _lower_words(words: Union[List[str], NormalizedSentence]) -> List[str]:
+    """Lowercased, stripped words; already done for a NormalizedSentence."""
+    if isinstance(words, NormalizedSentence):
+        return list(words.lower_words)
+    return [w.lower().strip() for w in words]
+
 
 @dataclass
 class WordValidationResult:
@@ -30,8 +68,8 @@ class WordValidationResult:
 
 
 def validate_word_count(
-    user_words: List[str],
-    reference_words: List[str]
+    user_words: Union[List[str], NormalizedSentence],
+    reference_words: Union[List[str], NormalizedSentence]
 ) -> WordValidationResult:
     """
     Validate that user spoke the correct number of words.
@@ -41,16 +79,17 @@ def validate_word_count(
     Args:
         user_words: Words transcribed from user audio
         reference_words: Words from reference sentence
+            (either may be a NormalizedSentence)
     
     Returns:
         WordValidationResult with missing/extra words info
     """
-    user_count = len(user_words)
-    ref_count = len(reference_words)
-    
     # Normalize for comparison
-    user_lower = [w.lower().strip() for w in user_words]
-    ref_lower = [w.lower().strip() for w in reference_words]
+    user_lower = _lower_words(user_words)
+    ref_lower = _lower_words(reference_words)
+    
+    user_count = len(user_lower)
+    ref_count = len(ref_lower)
     
     if user_count == ref_count:
         # Counts match - check if words are aligned
@@ -147,28 +186,30 @@ def align_words_dtw(
     
     Uses edit distance to find optimal word alignment.
     """
-    from .edit_distance import edit_distance
-    
     alignment = []
-    used_user_indices = set()
+    
+    # All reference x user distances at once; taken user words become inf.
+    # Distances past the loosest acceptance threshold are capped early.
+    max_accepted = max((len(w) // 2 + 1 for w in reference_words), default=1)
+    distances = edit_distance_matrix(
+        reference_words, user_words, score_cutoff=max_accepted
+    ).astype(np.float64)
     
     # For each reference word, find best matching user word
     for ref_idx, ref_word in enumerate(reference_words):
         best_match_idx = -1
         best_distance = float('inf')
         
-        for user_idx, user_word in enumerate(user_words):
-            if user_idx in used_user_indices:
-                continue
-            
-            dist = edit_distance(user_word, ref_word)
-            if dist < best_distance:
-                best_distance = dist
-                best_match_idx = user_idx
+        if user_words:
+            row = distances[ref_idx]
+            candidate = int(row.argmin())
+            if row[candidate] != np.inf:
+                best_match_idx = candidate
+                best_distance = int(row[candidate])
         
         # Accept match if distance is reasonable (< half word length)
         if best_match_idx >= 0 and best_distance <= len(ref_word) // 2 + 1:
-            used_user_indices.add(best_match_idx)
+            distances[:, best_match_idx] = np.inf
             alignment.append({
                 'position': ref_idx,
                 'reference': ref_word,
@@ -200,34 +241,46 @@ def find_missing_words(
     """
     Find which reference words are missing from user speech.
     
-    Uses sequence matching to identify gaps.
+    Uses sequence matching to identify gaps. Exact word matches are sieved
+    out first, one per occurrence the user said, and only the residual goes
+    through the O(N*M) sequence matcher.
     """
-    from difflib import SequenceMatcher
+    # Count-based sieve: each reference word is removed min(user count,
+    # reference count) times. Extra reference occurrences stay in the
+    # residual and can still be reported missing, even though the user said
+    # the word (said 'on' twice, reference has it three times -> 'on' may
+    # be reported once)
+    common = Counter(user_words) & Counter(reference_words)
+    residual_ref = _without_words(reference_words, common)
+    if not residual_ref:
+        return []
+    residual_user = _without_words(user_words, common)
     
     missing = []
-    matcher = SequenceMatcher(None, user_words, reference_words)
+    # No autojunk: frequent words ("the") must still be matchable in long passages
+    matcher = SequenceMatcher(None, residual_user, residual_ref, autojunk=False)
     
     for tag, i1, i2, j1, j2 in matcher.get_opcodes():
         if tag == 'delete':
             # Words in reference but not in user
-            missing.extend(reference_words[j1:j2])
+            missing.extend(residual_ref[j1:j2])
         elif tag == 'replace':
             # Check if any reference words have no close match
-            for ref_word in reference_words[j1:j2]:
+            for ref_word in residual_ref[j1:j2]:
                 found_similar = False
-                for user_word in user_words[i1:i2]:
+                for user_word in residual_user[i1:i2]:
                     # Consider similar if edit distance < half length
-                    from .edit_distance import edit_distance
-                    if edit_distance(user_word, ref_word) <= len(ref_word) // 2:
+                    if edit_distance_within(user_word, ref_word, len(ref_word) // 2):
                         found_similar = True
                         break
                 if not found_similar:
                     missing.append(ref_word)
     
-    # Also check simple set difference as fallback
+    # Also check simple set difference as fallback (sieved-out words are
+    # all in user_set, so the residual covers every candidate)
     if not missing:
         user_set = set(user_words)
-        for ref_word in reference_words:
+        for ref_word in residual_ref:
             if ref_word not in user_set:
                 # Check for close matches
                 has_close = any(
@@ -241,6 +294,18 @@ def find_missing_words(
     return missing
 
 
+def _without_words(words: List[str], counts: Counter) -> List[str]:
+    """words minus counts[w] occurrences of each w (earliest first), in order."""
+    remaining = counts.copy()
+    residual = []
+    for word in words:
+        if remaining[word] > 0:
+            remaining[word] -= 1
+        else:
+            residual.append(word)
+    return residual
+
+
 def find_extra_words(
     user_words: List[str],
     reference_words: List[str]
@@ -248,25 +313,28 @@ def find_extra_words(
     """
     Find extra words user spoke that aren't in reference.
     """
-    extra = []
     ref_set = set(reference_words)
+    candidates = [w for w in user_words if w not in ref_set]
+    if not candidates:
+        return []
     
-    for user_word in user_words:
-        if user_word not in ref_set:
-            # Check if it's a close match to any reference word
-            from .edit_distance import edit_distance
-            is_close = any(
-                edit_distance(user_word, ref) <= len(ref) // 2
-                for ref in reference_words
-            )
-            if not is_close:
-                extra.append(user_word)
-    
-    return extra
+    # Close match = within half a reference word's length of any reference
+    # word; one distance matrix covers every candidate
+    thresholds = np.fromiter(
+        (len(ref) // 2 for ref in reference_words),
+        dtype=np.int32,
+        count=len(reference_words)
+    )
+    distances = edit_distance_matrix(
+        candidates, reference_words, score_cutoff=int(thresholds.max(initial=0))
+    )
+    is_close = (distances <= thresholds).any(axis=1)
+    
+    return [word for word, close in zip(candidates, is_close.tolist()) if not close]
 
 
 def get_word_phoneme_map(
-    sentence_text: str,
+    sentence_text: Union[str, NormalizedSentence],
     phoneme_sequence: List[str]
 ) -> Dict[str, List[str]]:
     """
@@ -275,19 +343,21 @@ def get_word_phoneme_map(
     This is the ground truth reference for phoneme comparison.
     
     Args:
-        sentence_text: Full sentence text
+        sentence_text: Full sentence text (or its NormalizedSentence)
         phoneme_sequence: Full phoneme sequence from DB
     
     Returns:
         Dict mapping each word to its phonemes
     """
+    if not isinstance(sentence_text, NormalizedSentence):
+        sentence_text = normalize_sentence(sentence_text)
+    
     try:
-        from g2p_en import G2p
-        g2p = G2p()
+        from .phoneme_extractor import get_g2p
     except ImportError:
         logger.warning("g2p_en not available, using stored sequence")
         # Fallback: distribute phonemes evenly across words
-        words = sentence_text.split()
+        words = sentence_text.original_words
         phonemes_per_word = len(phoneme_sequence) // len(words) if words else 0
         return {
             word: phoneme_sequence[i*phonemes_per_word:(i+1)*phonemes_per_word]
@@ -295,16 +365,25 @@ def get_word_phoneme_map(
         }
     
     word_phonemes = {}
-    words = sentence_text.split()
     
-    for word in words:
-        # Get phonemes for this word
-        phonemes = g2p(word)
-        # Filter out non-phoneme symbols
-        clean_phonemes = [
-            p.upper() for p in phonemes 
-            if p.strip() and not p.isspace() and p not in [' ', "'", '-']
-        ]
-        word_phonemes[word.lower()] = clean_phonemes
+    for word_lower in sentence_text.lower_words:
+        word_phonemes[word_lower] = list(_word_phonemes(word_lower))
     
     return word_phonemes
+
+
+@lru_cache(maxsize=50000)
+def _word_phonemes(word_lower: str) -> Tuple[str, ...]:
+    """
+    G2P phonemes for one word, cached across sentences and users.
+    
+    g2p_en lowercases its input itself, so keying on the lowercased word
+    loses nothing. Tuple keeps the cached value immutable.
+    """
+    from .phoneme_extractor import get_g2p
+    
+    # Filter out non-phoneme symbols (p.strip() also drops whitespace-only tokens)
+    return tuple(
+        p.upper() for p in get_g2p()(word_lower)
+        if p.strip() and p not in _BAD_PHONEMES
+    )
@@ -0,0 +1,62 @@
+"""
+Background Task Runner for Pronunex.
+
+Shared, bounded thread pool for fire-and-forget work that should not block
+the HTTP response (analytics updates, LLM feedback, TTS generation).
+
+Replaces ad-hoc `threading.Thread(...).start()` per request: the pool caps
+concurrent background work so a burst of requests cannot spawn an unbounded
+number of threads, and each task releases its DB connection when done.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+# Max concurrent background tasks per process (I/O-bound: LLM/TTS/DB)
+MAX_BACKGROUND_WORKERS = 8
+
+# Singleton executor
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_background_executor() -> ThreadPoolExecutor:
+    """Get or create the process-wide background executor."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_BACKGROUND_WORKERS,
+                    thread_name_prefix='pronunex-bg',
+                )
+    return _executor
+
+
+def _run_task(func, args, kwargs):
+    """Run a task, logging failures and releasing the thread's DB connection."""
+    try:
+        return func(*args, **kwargs)
+    except Exception as e:
+        logger.error(f"Background task {getattr(func, '__name__', func)} failed: {e}")
+    finally:
+        close_old_connections()
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Submit a fire-and-forget task to the shared background pool.
+
+    Args:
+        func: Callable to run
+        *args, **kwargs: Arguments passed to func
+
+    Returns:
+        concurrent.futures.Future for the task
+    """
+    return get_background_executor().submit(_run_task, func, args, kwargs)
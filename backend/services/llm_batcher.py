@@ -0,0 +1,138 @@
+"""
+LLM Request Batching for Pronunex.
+
+Coalesces small, independent LLM requests from concurrent users into one
+prompt. Each caller submits a single entry and gets a Future; a collector
+thread waits briefly for more entries, then sends them together as
+"[1] ... [2] ..." and splits the returned JSON array back by index.
+
+N concurrent requests cost ~N/batch_size round-trips instead of N, at the
+price of at most `max_wait` seconds of added latency for the first entry.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Flush when this many entries are pending...
+BATCH_MAX_SIZE = 8
+# ...or when the oldest pending entry has waited this long (seconds)
+BATCH_MAX_WAIT = 0.025
+# Batches in flight at once per client. A dedicated pool, so tip requests
+# never queue behind TTS/analytics work on the shared background pool
+BATCH_SENDERS = 2
+
+
+class BatchingLLMClient:
+    """
+    Micro-batching wrapper around LLMService for one kind of request.
+
+    The prompt template is formatted with {count} and {entries} (the numbered
+    entry lines) and must ask for a JSON array with one result per entry.
+    A batch of one is simply a single call with the same template.
+    """
+
+    def __init__(
+        self,
+        llm_service,
+        prompt_template: str,
+        max_tokens_per_entry: int = 100,
+        temperature: float = 0.3,
+        max_batch: int = BATCH_MAX_SIZE,
+        max_wait: float = BATCH_MAX_WAIT
+    ):
+        self.llm_service = llm_service
+        self.prompt_template = prompt_template
+        self.max_tokens_per_entry = max_tokens_per_entry
+        self.temperature = temperature
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self._queue = queue.Queue()
+        self._collector = None
+        self._collector_lock = threading.Lock()
+        self._senders = None
+
+    def submit(self, entry: str) -> Future:
+        """
+        Queue one entry for the next batch.
+
+        Returns:
+            Future resolving to this entry's result, or None if the LLM call
+            failed or its response couldn't be matched back to the entries
+        """
+        self._ensure_collector()
+        future = Future()
+        self._queue.put((entry, future))
+        return future
+
+    def _ensure_collector(self):
+        """Start the collector thread and sender pool on first use."""
+        if self._collector is None:
+            with self._collector_lock:
+                if self._collector is None:
+                    self._senders = ThreadPoolExecutor(
+                        max_workers=BATCH_SENDERS,
+                        thread_name_prefix='pronunex-llm-send',
+                    )
+                    self._collector = threading.Thread(
+                        target=self._collect,
+                        name='pronunex-llm-batch',
+                        daemon=True,
+                    )
+                    self._collector.start()
+
+    def _collect(self):
+        """Gather entries into batches and hand each batch off for sending."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Send on the sender pool so the next batch keeps collecting
+            # while this one is in flight
+            self._senders.submit(self._send_batch, batch)
+
+    def _send_batch(self, batch: List[tuple]):
+        """Send one batch and resolve its futures (always, even on failure)."""
+        results: List[Optional[object]] = [None] * len(batch)
+
+        try:
+            entries = '\n'.join(
+                f"[{i}] {entry}" for i, (entry, _) in enumerate(batch, start=1)
+            )
+            prompt = self.prompt_template.format(count=len(batch), entries=entries)
+
+            response = self.llm_service.generate(
+                prompt=prompt,
+                max_tokens=self.max_tokens_per_entry * len(batch),
+                temperature=self.temperature,
+                response_format="json"
+            )
+
+            content = response.get('content') if response.get('success') else None
+            if isinstance(content, list) and len(content) == len(batch):
+                results = content
+            elif content is not None:
+                logger.warning(
+                    f"LLM batch response did not match {len(batch)} entries; "
+                    f"falling back for this batch"
+                )
+        except Exception as e:
+            logger.warning(f"LLM batch of {len(batch)} failed: {e}")
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -18,6 +18,12 @@ import hashlib
 from typing import Optional
 from django.conf import settings
 
+# Rust JSON parser; its JSONDecodeError subclasses json.JSONDecodeError
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -189,7 +195,7 @@ class LLMService:
                 content = parts[1]
         
         try:
-            return json.loads(content.strip())
+            return _json_loads(content.strip())
         except json.JSONDecodeError:
             pass
         
@@ -199,7 +205,7 @@ class LLMService:
         
         for match in matches:
             try:
-                return json.loads(match)
+                return _json_loads(match)
             except json.JSONDecodeError:
                 continue
         
@@ -216,7 +222,7 @@ class LLMService:
                     if brace_count == 0:
                         json_str = original_content[start_idx:start_idx + i + 1]
                         try:
-                            return json.loads(json_str)
+                            return _json_loads(json_str)
                         except json.JSONDecodeError:
                             break
         